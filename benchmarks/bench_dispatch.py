@@ -0,0 +1,179 @@
+"""
+Benchmark of cross-thread dialog dispatch latency and throughput.
+
+Worker threads call the `MessageBoxHandler` dialogs while the main thread runs the
+Qt event loop. Every dialog is dismissed by an event filter as soon as it is shown,
+so the numbers cover dispatch, construction, styling and the wakeup of the caller.
+
+Modes:
+    blocking  Each call blocks its worker until the dialog is closed.
+    future    Each worker submits all its calls with `as_future=True`, then waits for them.
+
+Run with:
+    python benchmarks/bench_dispatch.py --threads 1,4,16,64 --output results.json
+
+The results are printed as a table and written as JSON to compare across releases.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog, QPushButton
+from PyQt5.QtCore import QObject, QEvent, QEventLoop, QTimer, QT_VERSION_STR, PYQT_VERSION_STR
+
+from qt_user_massages import MessageBoxHandler
+
+# How to call every dialog type, extra keyword arguments are passed through
+DIALOGS = {
+    "yes_no": lambda h, **kw: h.yes_no_message("Bench", "Proceed?", **kw),
+    "yes_no_continue": lambda h, **kw: h.yes_no_continue_message("Bench", "Proceed?", **kw),
+    "info": lambda h, **kw: h.info_message("Bench", "Information", **kw),
+    "warning": lambda h, **kw: h.warning_message("Bench", "Warning", **kw),
+    "error": lambda h, **kw: h.error_message("Bench", "Error", **kw),
+    "combo_box": lambda h, **kw: h.combo_box_message("Bench", "Select", options=["A", "B", "C"], **kw),
+    "instruction": lambda h, **kw: h.instruction_message_with_image("Bench", "Instructions", **kw),
+}
+
+MODES = ("blocking", "future")
+
+
+class AutoDismiss(QObject):
+    """
+    Event filter that closes every message box and dialog right after it is shown.
+    """
+    def eventFilter(self, obj, event) -> bool:
+        if event.type() == QEvent.Type.Show:
+            if isinstance(obj, QMessageBox):
+                QTimer.singleShot(0, lambda: obj.buttons()[0].click())
+            elif isinstance(obj, QDialog):
+                QTimer.singleShot(0, lambda: self._own_buttons(obj)[-1].click())
+        return False
+
+    @staticmethod
+    def _own_buttons(dialog:QDialog) -> list:
+        # Dialogs opened meanwhile are children of the active one, skip their buttons
+        return [button for button in dialog.findChildren(QPushButton) if button.window() is dialog]
+
+def _percentile(values:list, q:float) -> float:
+    """
+    Nearest-rank percentile of sorted values.
+    """
+    if not values: return float("nan")
+    return values[min(len(values) - 1, max(0, int(round(q / 100 * len(values))) - 1))]
+
+def _worker_blocking(handler, call, calls:int, barrier, latencies:list) -> None:
+    barrier.wait()
+    for _ in range(calls):
+        start = time.perf_counter()
+        call(handler)
+        latencies.append(time.perf_counter() - start)
+
+def _worker_future(handler, call, calls:int, barrier, latencies:list) -> None:
+    barrier.wait()
+    futures = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        future = call(handler, as_future=True)
+        future.add_done_callback(lambda _, start=start: latencies.append(time.perf_counter() - start))
+        futures.append(future)
+
+    for future in futures:
+        future.result()
+
+def run_case(handler, dialog:str, mode:str, threads:int, calls:int) -> dict:
+    """
+    Run one dialog type in one mode with the given number of calling threads.
+
+    :return: The latency percentiles in milliseconds and the throughput in dialogs per second.
+    """
+    call = DIALOGS[dialog]
+    target = _worker_blocking if mode == "blocking" else _worker_future
+    latencies = []
+    barrier = threading.Barrier(threads + 1)
+
+    workers = [threading.Thread(target=target, args=(handler, call, calls, barrier, latencies), daemon=True)
+               for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+
+    # Keep the main thread in its event loop until every worker is done
+    loop = QEventLoop()
+    check = QTimer()
+    check.timeout.connect(lambda: all(not w.is_alive() for w in workers) and loop.quit())
+    check.start(1)
+
+    barrier.wait()
+    start = time.perf_counter()
+    loop.exec_()
+    elapsed = time.perf_counter() - start
+    check.stop()
+
+    latencies.sort()
+    return {
+        "dialog": dialog,
+        "mode": mode,
+        "threads": threads,
+        "calls": len(latencies),
+        "p50_ms": _percentile(latencies, 50) * 1e3,
+        "p99_ms": _percentile(latencies, 99) * 1e3,
+        "mean_ms": sum(latencies) / len(latencies) * 1e3,
+        "max_ms": latencies[-1] * 1e3,
+        "dialogs_per_sec": len(latencies) / elapsed,
+    }
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--threads", default="1,4,16,64", help="Comma separated calling thread counts.")
+    parser.add_argument("--calls", type=int, default=20, help="Calls per thread and case.")
+    parser.add_argument("--dialogs", default=",".join(DIALOGS), help="Comma separated dialog types.")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma separated modes: blocking, future.")
+    parser.add_argument("--pool-size", type=int, default=0, help="Dialog pool size of the handler.")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    app.setQuitOnLastWindowClosed(False)
+    dismiss = AutoDismiss()
+    app.installEventFilter(dismiss)
+
+    handler = MessageBoxHandler(pool_size=args.pool_size)
+    handler.warm_pool()
+
+    results = []
+    for dialog in args.dialogs.split(","):
+        for mode in args.modes.split(","):
+            for threads in (int(t) for t in args.threads.split(",")):
+                result = run_case(handler, dialog, mode, threads, args.calls)
+                results.append(result)
+                print(f"{dialog:16} {mode:9} threads={threads:<3} p50={result['p50_ms']:8.2f}ms "
+                      f"p99={result['p99_ms']:8.2f}ms {result['dialogs_per_sec']:8.1f} dialogs/s", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "qt": QT_VERSION_STR,
+            "pyqt": PYQT_VERSION_STR,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
@@ -0,0 +1,139 @@
+"""
+Benchmark of the per-call dispatch overhead of `MessageBoxHandler`.
+
+A registered dialog type that returns without showing anything isolates the cost of a call:
+argument handling, the main thread check and the trip to the main thread and back.
+The same calls through the former dispatch, `QApplication.instance()` plus `QThread.currentThread()`
+and `QMetaObject.invokeMethod` with a `Q_ARG` per argument, are measured alongside as the baseline.
+
+Cases:
+    main      Calls from the main thread, which run the dialog right away.
+    blocking  Calls from a worker thread, each waiting until the main thread ran it.
+    queued    Calls from a worker thread with `block=False`, the time to queue them.
+
+Run with:
+    python benchmarks/bench_overhead.py --calls 20000 --output overhead.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import (QObject, QThread, QMetaObject, QEventLoop, QTimer, Qt, Q_ARG, Q_RETURN_ARG, pyqtSlot,
+                          QT_VERSION_STR, PYQT_VERSION_STR)
+
+from qt_user_massages import MessageBoxHandler, DialogSpec
+
+CASES = ("main", "blocking", "queued")
+
+
+def show_nothing(handler, title, content, button_yes, button_no) -> bool:
+    return True
+
+
+MessageBoxHandler.register_dialog(DialogSpec(
+    "bench_message", "bench", show_nothing,
+    (("title", "Title"), ("content", "Content"), ("button_yes", "Yes"), ("button_no", "No"))))
+
+
+class LegacyDispatch(QObject):
+    """
+    The dispatch of the dialog methods before the dialog registry, with the same do-nothing slot.
+    """
+    @pyqtSlot(str, str, str, str, result=bool.__name__)
+    def _bench_message(self, title, content, yes_text, no_text) -> bool:
+        return True
+
+    def bench_message(self, title="Title", content="Content", button_yes="Yes", button_no="No", block=True):
+        instance = QApplication.instance()
+        if instance and QThread.currentThread() == instance.thread():
+            return self._bench_message(title, content, button_yes, button_no)
+
+        args = [Q_ARG(str, title), Q_ARG(str, content), Q_ARG(str, button_yes), Q_ARG(str, button_no)]
+        if not block:
+            # Queued calls can't have a return value
+            QMetaObject.invokeMethod(self, self._bench_message.__name__, Qt.ConnectionType.QueuedConnection, *args)
+            return None
+
+        return QMetaObject.invokeMethod(self, self._bench_message.__name__,
+                                        Qt.ConnectionType.BlockingQueuedConnection, Q_RETURN_ARG(bool), *args)
+
+
+def _time_calls(call, calls:int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return time.perf_counter() - start
+
+
+def run_case(target, case:str, calls:int) -> float:
+    """
+    :return: The mean time per call in microseconds.
+    """
+    if case == "main":
+        return _time_calls(lambda: target.bench_message("Bench", "Proceed?"), calls) / calls * 1e6
+
+    block = case == "blocking"
+    elapsed = []
+    worker = threading.Thread(daemon=True, target=lambda: elapsed.append(
+        _time_calls(lambda: target.bench_message("Bench", "Proceed?", block=block), calls)))
+
+    # Keep the main thread in its event loop until the worker is done and its calls ran
+    loop = QEventLoop()
+    check = QTimer()
+    check.timeout.connect(lambda: not worker.is_alive() and loop.quit())
+    check.start(1)
+    worker.start()
+    loop.exec_()
+    check.stop()
+    QApplication.processEvents()
+    return elapsed[0] / calls * 1e6
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=20000, help="Calls per case.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case, the fastest one counts.")
+    parser.add_argument("--cases", default=",".join(CASES), help="Comma separated cases: main, blocking, queued.")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    targets = {"handler": MessageBoxHandler(), "legacy": LegacyDispatch()}
+
+    results = []
+    for case in args.cases.split(","):
+        for name, target in targets.items():
+            us_per_call = min(run_case(target, case, args.calls) for _ in range(args.repeat))
+            results.append({"case": case, "dispatch": name, "calls": args.calls, "us_per_call": us_per_call})
+            print(f"{case:9} {name:8} {us_per_call:8.2f} us/call", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "qt": QT_VERSION_STR,
+            "pyqt": PYQT_VERSION_STR,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
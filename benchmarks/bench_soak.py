@@ -0,0 +1,225 @@
+"""
+Soak test of the dialog lifecycle of `MessageBoxHandler`: shows a long series of dialogs of every
+built-in kind and checks that the resident memory, the number of live widgets and the dialogs
+reported alive by `dialog_stats` stay flat.
+
+A worker thread asks the questions one after the other, an event filter in the main thread answers
+every dialog as soon as it is shown. The dialogs are parented to a visible main window, like in an
+application, so a dialog that is never deleted lives as long as that window. Every `--sample-every`
+dialogs, the main thread processes the pending deletions and takes a sample. Where glibc is the allocator,
+the heap is trimmed first: freed memory it keeps for reuse would otherwise show up as growth.
+The pixmap cache is cleared as well. The styles cache their drawings there by palette, and the palette of
+every dialog shown non-modally gets a new key, so the cache fills up to its limit (`QPixmapCache.cacheLimit`).
+The flat memory therefore depends on the trim: `rss_untrimmed_mb` records the memory before it, which
+only covers what one interval added, and `--no-trim` shows the growth an application sees.
+
+Run with:
+    python benchmarks/bench_soak.py --dialogs 100000 --output soak.json
+"""
+import argparse
+import ctypes
+import gc
+import json
+import os
+import platform
+import resource
+import sys
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication, QDialog, QMainWindow
+from PyQt5.QtGui import QPixmapCache
+from PyQt5.QtCore import (QObject, QEvent, QTimer, QMetaObject, Qt, pyqtSlot,
+                          QT_VERSION_STR, PYQT_VERSION_STR)
+from PyQt5 import sip
+
+from qt_user_massages import MessageBoxHandler
+
+# A long content is shown in a details dialog
+LONG_CONTENT = "Traceback (most recent call last):\n" + '  File "job.py", line 1, in run\n' * 400 + "ValueError: x\n"
+
+CALLS = (
+    lambda handler: handler.yes_no_message("Soak", "Proceed?"),
+    lambda handler: handler.yes_no_continue_message("Soak", "Proceed?"),
+    lambda handler: handler.info_message("Soak", "Done."),
+    lambda handler: handler.warning_message("Soak", "Careful."),
+    lambda handler: handler.error_message("Soak", LONG_CONTENT),
+    lambda handler: handler.combo_box_message("Soak", "Pick one", options=["a", "b", "c"]),
+    lambda handler: handler.filtered_combo_box_message("Soak", "Pick one", options=["a", "b", "c"]),
+    lambda handler: handler.yes_no_batch_message("Soak", "Pick", items=["a", "b"]),
+    lambda handler: handler.instruction_message_with_image("Soak", "Read this."),
+)
+
+
+def rss_mb() -> float:
+    """
+    :return: The current resident memory of the process, or the peak where the current one is unknown.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Bytes on macOS, kilobytes elsewhere
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def trim_heap() -> bool:
+    """
+    Return the free memory of the heap to the system, with glibc only.
+
+    :return: Whether the heap could be trimmed.
+    """
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+        return True
+    except (OSError, AttributeError):
+        return False
+
+
+class AutoAnswer(QObject):
+    """
+    Closes every dialog right after it is shown, from the event loop, and activates the main window again
+    like a window manager would, so the next dialog is parented to it.
+    """
+    def __init__(self, window:QMainWindow) -> None:
+        super().__init__()
+        self._window = window
+        self._shown = []
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._close_shown)
+
+    def eventFilter(self, obj, event) -> bool:
+        if event.type() == QEvent.Type.Show and isinstance(obj, QDialog):
+            self._shown.append(obj)
+            self._timer.start(0)
+        return False
+
+    def _close_shown(self) -> None:
+        shown, self._shown = self._shown, []
+        for dialog in shown:
+            if not sip.isdeleted(dialog) and dialog.isVisible(): dialog.done(0)
+        # After the deactivation the closed dialog causes
+        QTimer.singleShot(0, self._activate)
+
+    def _activate(self) -> None:
+        QApplication.setActiveWindow(self._window)
+
+
+class Sampler(QObject):
+    """
+    Takes the samples in the main thread, where the widgets can be counted.
+    """
+    def __init__(self, handler:MessageBoxHandler, trim:bool) -> None:
+        super().__init__()
+        self.handler = handler
+        self.trim = trim
+        self.dialogs = 0
+        self.samples = []
+
+    @pyqtSlot()
+    def sample(self) -> None:
+        QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+        gc.collect()
+        untrimmed = rss_mb()
+        if self.trim:
+            QPixmapCache.clear()
+            trim_heap()
+        stats = self.handler.dialog_stats()
+        self.samples.append({
+            "dialogs": self.dialogs,
+            "rss_mb": round(rss_mb(), 2),
+            "rss_untrimmed_mb": round(untrimmed, 2),
+            "widgets": len(QApplication.allWidgets()),
+            "alive": sum(kind["alive"] for kind in stats.values()),
+            "created": sum(kind["created"] for kind in stats.values()),
+        })
+        print(f"{self.dialogs:8} dialogs {self.samples[-1]['rss_mb']:8.1f} MB "
+              f"({self.samples[-1]['rss_untrimmed_mb']:.1f} MB untrimmed) "
+              f"{self.samples[-1]['widgets']:6} widgets {self.samples[-1]['alive']:4} alive", file=sys.stderr)
+
+
+def run(handler:MessageBoxHandler, sampler:Sampler, dialogs:int, sample_every:int) -> None:
+    """
+    Ask `dialogs` questions from a worker thread while the main thread runs its event loop.
+    """
+    def worker():
+        for index in range(dialogs):
+            CALLS[index % len(CALLS)](handler)
+            sampler.dialogs = index + 1
+            if sampler.dialogs % sample_every == 0:
+                QMetaObject.invokeMethod(sampler, sampler.sample.__name__, Qt.ConnectionType.BlockingQueuedConnection)
+        QMetaObject.invokeMethod(QApplication.instance(), "quit", Qt.ConnectionType.QueuedConnection)
+
+    threading.Thread(target=worker, daemon=True).start()
+    QApplication.exec_()
+
+
+def growth(samples:list, name:str) -> float:
+    """
+    :return: The change of a measure between the first sample after warm-up and the last one.
+    """
+    start = samples[min(1, len(samples) - 1)]
+    return round(samples[-1][name] - start[name], 2)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--dialogs", type=int, default=100000, help="Dialogs to show.")
+    parser.add_argument("--sample-every", type=int, default=5000, help="Dialogs between two samples.")
+    parser.add_argument("--pool-size", type=int, default=0, help="The `pool_size` of the handler.")
+    parser.add_argument("--modeless", action="store_true", help="Use a `modeless` handler.")
+    parser.add_argument("--no-trim", action="store_true", help="Don't trim the heap and the pixmap cache before the samples.")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    app.setQuitOnLastWindowClosed(False)
+
+    window = QMainWindow()
+    window.resize(800, 600)
+    window.show()
+    # Not every platform plugin activates a shown window by itself
+    QApplication.setActiveWindow(window)
+    answer = AutoAnswer(window)
+    app.installEventFilter(answer)
+
+    handler = MessageBoxHandler(pool_size=args.pool_size, modeless=args.modeless)
+    sampler = Sampler(handler, not args.no_trim)
+    start = time.perf_counter()
+    run(handler, sampler, args.dialogs, args.sample_every)
+    elapsed = time.perf_counter() - start
+
+    samples = sampler.samples
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "qt": QT_VERSION_STR,
+            "pyqt": PYQT_VERSION_STR,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "args": vars(args),
+        },
+        "seconds": round(elapsed, 1),
+        "rss_growth_mb": growth(samples, "rss_mb") if samples else None,
+        "rss_untrimmed_growth_mb": growth(samples, "rss_untrimmed_mb") if samples else None,
+        "widget_growth": growth(samples, "widgets") if samples else None,
+        "alive_growth": growth(samples, "alive") if samples else None,
+        "dialog_stats": handler.dialog_stats(),
+        "samples": samples,
+    }
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
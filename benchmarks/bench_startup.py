@@ -0,0 +1,136 @@
+"""
+Benchmark of the start-up cost of `qt_user_massages`, each run in a fresh interpreter.
+
+Importing the module doesn't import PyQt5, the first use of one of its names does. The handler sets up Qt
+on its first dialog: `warmup` pays the QApplication, the style and the palette up front.
+
+Cases:
+    import        Import the module, all a tool that never uses the handler pays. Checks that PyQt5 isn't loaded.
+    handler       Import it and build a `MessageBoxHandler`, which loads PyQt5.
+    warmup        Build a handler and call `warmup`, all that building a handler used to cost.
+    first_dialog  Build a handler and show a first dialog, until it is painted.
+
+Byte-compile the package first (`python -m compileall .`): an interpreter that can't write its
+bytecode cache, e.g. with PYTHONDONTWRITEBYTECODE, compiles the module again in every run.
+
+Run with:
+    python benchmarks/bench_startup.py --runs 20 --output startup.json
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CASES = ("import", "handler", "warmup", "first_dialog")
+
+
+def run_child(case:str) -> dict:
+    """
+    Run one case in this interpreter, which must not have imported PyQt5 yet.
+
+    :return: The milliseconds of every phase, whether PyQt5 is loaded and whether a QApplication exists at the end.
+    """
+    phases = {}
+    start = time.perf_counter()
+    module = importlib.import_module("qt_user_massages")
+    phases["import"] = (time.perf_counter() - start) * 1000
+    if "PyQt5.QtWidgets" in sys.modules: raise AssertionError("Importing qt_user_massages imported PyQt5")
+
+    if case != "import":
+        start = time.perf_counter()
+        metrics = module.DialogMetrics()
+        handler = module.MessageBoxHandler(metrics=metrics)
+        phases["handler"] = (time.perf_counter() - start) * 1000
+
+    if case == "warmup":
+        start = time.perf_counter()
+        handler.warmup()
+        phases["warmup"] = (time.perf_counter() - start) * 1000
+    elif case == "first_dialog":
+        # The timeout closes the dialog once it is shown
+        start = time.perf_counter()
+        handler.info_message("Startup", "Ready.", timeout=0.05)
+        timing = metrics.recent[-1]
+        phases["first_dialog"] = ((timing.shown or timing.built) - start) * 1000
+
+    # Without loading PyQt5 for the check
+    widgets = sys.modules.get("PyQt5.QtWidgets")
+    phases["pyqt"] = widgets is not None
+    phases["qapplication"] = widgets is not None and widgets.QApplication.instance() is not None
+    return phases
+
+
+def run_case(case:str, runs:int) -> dict:
+    """
+    :return: The median milliseconds of every phase and of the whole process, over `runs` fresh interpreters.
+    """
+    command = [sys.executable, os.path.abspath(__file__), "--child", case]
+    samples = []
+    # The first run warms up the disk cache and is not counted
+    for index in range(runs + 1):
+        start = time.perf_counter()
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        elapsed = (time.perf_counter() - start) * 1000
+        if index: samples.append(dict(json.loads(output.splitlines()[-1]), process=elapsed))
+
+    flags = ("pyqt", "qapplication")
+    result = dict({"case": case, "runs": runs}, **{flag: samples[-1][flag] for flag in flags})
+    for phase in samples[-1]:
+        if phase not in flags:
+            result[phase + "_ms"] = round(statistics.median(sample[phase] for sample in samples), 2)
+    return result
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=20, help="Fresh interpreters per case, the median counts.")
+    parser.add_argument("--cases", default=",".join(CASES),
+                        help="Comma separated cases: import, handler, warmup, first_dialog.")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout.")
+    parser.add_argument("--child", choices=CASES, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.child:
+        print(json.dumps(run_child(args.child)))
+        sys.exit()
+
+    results = []
+    for case in args.cases.split(","):
+        results.append(run_case(case, args.runs))
+        phases = " ".join(f"{name[:-3]} {value:7.1f} ms" for name, value in results[-1].items()
+                          if name.endswith("_ms"))
+        print(f"{case:13} {phases}", file=sys.stderr)
+
+    # Only now, the runs had to start without it
+    from PyQt5.QtCore import QT_VERSION_STR, PYQT_VERSION_STR
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "qt": QT_VERSION_STR,
+            "pyqt": PYQT_VERSION_STR,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
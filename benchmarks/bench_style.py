@@ -0,0 +1,99 @@
+"""
+Micro-benchmark of the per-dialog styling cost.
+
+Compares the former per-widget stylesheet against the shared, cached palette
+used by `MessageBoxHandler._set_style`, and the per-handler cost of getting a QStyle.
+
+Run with:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_style.py --repeat 500
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication, QMessageBox, QStyleFactory
+
+from qt_user_massages import MessageBoxHandler, _get_cached_style
+
+def _time_per_call(func, repeat:int) -> float:
+    """
+    Run `func` `repeat` times and return the mean time per call in microseconds.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def bench_stylesheet(repeat:int) -> float:
+    """
+    Style a new message box the old way: setStyle, setStyleSheet and ensurePolished.
+    """
+    style = QStyleFactory.create("Fusion")
+
+    def run():
+        box = QMessageBox()
+        box.addButton("OK", QMessageBox.ButtonRole.AcceptRole)
+        box.setStyle(style)
+        box.setStyleSheet("background-color: White;")
+        box.ensurePolished()
+        box.deleteLater()
+
+    return _time_per_call(run, repeat)
+
+def bench_palette(repeat:int) -> float:
+    """
+    Style a new message box with the handler's cached style and palette.
+    """
+    handler = MessageBoxHandler()
+
+    def run():
+        box = QMessageBox()
+        box.addButton("OK", QMessageBox.ButtonRole.AcceptRole)
+        handler._set_style(box)
+        box.deleteLater()
+
+    return _time_per_call(run, repeat)
+
+def bench_cached_style(repeat:int) -> float:
+    """
+    Get the shared QStyle from the cache, as every handler now does.
+    """
+    _get_cached_style("Fusion", None)
+    return _time_per_call(lambda: _get_cached_style("Fusion", None), repeat)
+
+def bench_style_creation(repeat:int) -> float:
+    """
+    Create a fresh QStyle, as every handler used to do.
+    """
+    return _time_per_call(lambda: QStyleFactory.create("Fusion"), repeat)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=500, help="Calls per measure, the mean counts.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    repeat = args.repeat
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    # Warm up both paths once so that one-time costs are not measured
+    bench_stylesheet(10)
+    bench_palette(10)
+
+    stylesheet = bench_stylesheet(repeat)
+    palette = bench_palette(repeat)
+
+    new_style = bench_style_creation(repeat)
+    cached_style = bench_cached_style(repeat)
+
+    print(f"Per dialog, stylesheet:      {stylesheet:10.1f} us")
+    print(f"Per dialog, cached palette:  {palette:10.1f} us  ({stylesheet / palette:.1f}x faster)")
+    print(f"Per handler, new QStyle:     {new_style:10.1f} us")
+    print(f"Per handler, cached QStyle:  {cached_style:10.1f} us  ({new_style / cached_style:.1f}x faster)")
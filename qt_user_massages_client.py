@@ -0,0 +1,224 @@
+"""
+Client of a `DialogServer` (see `qt_user_massages`): shows the dialogs of a `MessageBoxHandler`
+that runs in another process. Only uses the standard library, so multiprocessing and
+ProcessPoolExecutor workers don't have to import PyQt5.
+"""
+from concurrent.futures import Future
+from typing import Optional, Any, Dict, Tuple, Callable
+import itertools
+import inspect
+import threading
+import json
+import os
+
+# The request for the dialog methods a DialogServer serves, answered with their parameters and docstrings
+DIALOGS_REQUEST = "__dialogs__"
+
+
+def encode_message(message:list) -> bytes:
+    """
+    Serialize a request [id, method, args, kwargs] or a reply [id, ok, result, timed_out].
+    """
+    return json.dumps(message, separators=(",", ":"), default=_to_json).encode()
+
+
+def _to_json(value:Any) -> Any:
+    # Paths, e.g. an image or details file, and sequences such as a tuple or generator of options
+    if isinstance(value, os.PathLike): return os.fspath(value)
+    if hasattr(value, "__iter__"): return list(value)
+    # Anything else is sent as its text, which is what the dialogs show
+    return str(value)
+
+
+def decode_message(data:bytes) -> list:
+    return json.loads(data)
+
+
+class RemoteDialogError(RuntimeError):
+    """
+    A dialog call failed in the server process, e.g. with `DialogQueueFull`.
+    """
+    def __init__(self, kind:str, message:str) -> None:
+        """
+        :param kind: The name of the exception raised in the server.
+        :param message: Its message.
+        """
+        super().__init__(f"{kind}: {message}")
+        self.kind = kind
+        self.message = message
+
+    def __reduce__(self) -> tuple:
+        # Pickled with both arguments, e.g. when a pool worker raises it to its parent
+        return type(self), (self.kind, self.message)
+
+
+class DialogClient:
+    """
+    Thread-safe proxy of a `MessageBoxHandler` served by a `DialogServer`, with the same dialog methods
+    (not their asyncio variants). The methods and their signatures are taken from the server.
+    Calls from all threads of a process share one connection and may be in flight at the same time.
+    The client can be pickled, e.g. passed to pool workers, and connects on its first call in every process.
+    """
+    def __init__(self, address:Any, authkey:Optional[bytes] = None) -> None:
+        """
+        :param address: The address of the server, see `DialogServer.address`.
+        :param authkey: The key the server authenticates its clients with, see `DialogServer.authkey`.
+        """
+        self.address = address
+        self.authkey = authkey
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        # Futures of the calls waiting for a reply, by request id
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count(1)
+        # Whether the last blocking call answered in a thread timed out
+        self._answers = threading.local()
+        # The signature and docstring of every dialog method of the server, by name
+        self._dialogs: Optional[Dict[str, Tuple[inspect.Signature, str]]] = None
+
+    def __getstate__(self) -> dict:
+        return {"address": self.address, "authkey": self.authkey}
+
+    def __setstate__(self, state:dict) -> None:
+        self.__init__(**state)
+
+    def close(self) -> None:
+        """
+        Close the connection of this process. The next call connects again.
+        """
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid(): self._conn.close()
+            self._conn = None
+
+    def timed_out(self) -> bool:
+        """
+        Check whether the last blocking call in the calling thread returned the default answer of its timeout.
+        Futures carry the same information in their `timed_out` attribute once resolved.
+        """
+        return getattr(self._answers, "timed_out", False)
+
+    def __getattr__(self, name:str) -> Callable[..., Any]:
+        """
+        Get a dialog method, e.g. `yes_no_message`, with the signature of the server's handler.
+        The methods are generated from the dialogs the server serves, those added with
+        `MessageBoxHandler.register_dialog` included, so the first one connects to the server.
+        """
+        # Private names and the special methods copy and pickle look up are never dialogs
+        if name.startswith("_"): raise AttributeError(name)
+
+        signatures = self._signatures(refresh=False)
+        # The server's handler may have registered the dialog since
+        if name not in signatures: signatures = self._signatures(refresh=True)
+        if name not in signatures: raise AttributeError(f"The dialog server has no dialog method {name!r}")
+
+        method = self._dialog_method(name, *signatures[name])
+        self.__dict__[name] = method
+        return method
+
+    def _signatures(self, refresh:bool) -> Dict[str, Tuple[inspect.Signature, str]]:
+        """
+        Get the signature and the docstring of every dialog method of the server, asking it on first use.
+        """
+        if self._dialogs is None or refresh:
+            table = self._call(DIALOGS_REQUEST, [], {}, True, True).result()
+            self._dialogs = {name: (self._signature(dialog["params"]), dialog["doc"])
+                             for name, dialog in table.items()}
+        return self._dialogs
+
+    @staticmethod
+    def _signature(params:list) -> inspect.Signature:
+        """
+        :param params: The parameters of a dialog method as [name, default, keyword-only] triples.
+        """
+        kinds = (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+        return inspect.Signature([inspect.Parameter(name, kinds[keyword_only], default=default)
+                                  for name, default, keyword_only in params])
+
+    def _dialog_method(self, name:str, signature:inspect.Signature, doc:str) -> Callable[..., Any]:
+        """
+        Make the method calling the dialog `name` of the server.
+        """
+        def method(*args, **kwargs):
+            # Only the arguments passed are sent, the server's handler applies its own defaults
+            arguments = signature.bind(*args, **kwargs).arguments
+            block = arguments.pop("block", True)
+            as_future = arguments.pop("as_future", False)
+            return self._call(name, [], dict(arguments), block, as_future)
+
+        method.__name__ = name
+        method.__qualname__ = f"{type(self).__name__}.{name}"
+        method.__signature__ = signature
+        method.__doc__ = doc
+        return method
+
+    def _call(self, method:str, args:list, kwargs:dict, block:bool, as_future:bool) -> Any:
+        """
+        Send a dialog call to the server and wait for its reply, if the caller asked for it.
+        """
+        future = Future()
+        with self._lock:
+            conn = self._connection()
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+            conn.send_bytes(encode_message([request_id, method, args, kwargs]))
+
+        if as_future: return future
+        if not block: return None
+
+        res = future.result()
+        self._answers.timed_out = future.timed_out
+        return res
+
+    def _connection(self):
+        """
+        Get the connection of this process, connecting first if needed. Must hold the lock.
+        """
+        # A forked process can't share the connection or the reader thread of its parent
+        if self._conn is None or self._pid != os.getpid():
+            # Imported on first use, importing the server module must not pull in multiprocessing
+            from multiprocessing.connection import Client
+
+            self._conn = Client(self.address, authkey=self.authkey)
+            self._pid = os.getpid()
+            self._pending = {}
+            threading.Thread(target=self._read_replies, args=(self._conn, self._pending),
+                             name="DialogClientReader", daemon=True).start()
+
+        return self._conn
+
+    def _read_replies(self, conn, pending:Dict[int, Future]) -> None:
+        """
+        Resolve the futures of the calls of one connection as their replies arrive, in any order.
+        Whatever ends the thread fails the calls still waiting, and the next call connects again.
+        """
+        error = ConnectionError("The dialog server closed the connection")
+        try:
+            while True:
+                request_id, ok, result, timed_out = decode_message(conn.recv_bytes())
+                with self._lock:
+                    future = pending.pop(request_id, None)
+                # A future cancelled by its caller before the reply arrived has nobody waiting on it
+                if future is None or not future.set_running_or_notify_cancel(): continue
+
+                # Set before the result, so a waiting thread always sees it
+                future.timed_out = timed_out
+                if ok:
+                    future.set_result(result)
+                else:
+                    future.set_exception(RemoteDialogError(*result))
+        except (EOFError, OSError, TypeError):
+            # TypeError: `close` closed the connection while it was being read
+            pass
+        except Exception as exc:
+            error = ConnectionError(f"Invalid reply from the dialog server: {exc!r}")
+        finally:
+            # Release everyone still waiting on the connection
+            with self._lock:
+                if self._conn is conn: self._conn = None
+                futures = list(pending.values())
+                pending.clear()
+            conn.close()
+
+            for future in futures:
+                if future.set_running_or_notify_cancel(): future.set_exception(error)
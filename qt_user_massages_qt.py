@@ -0,0 +1,4011 @@
+from PyQt5.QtWidgets import (
+    QApplication, QMessageBox, QDialog, QLabel, QVBoxLayout, QPushButton,
+    QComboBox, QWidget, QStyleFactory, QStyle, QLineEdit, QCheckBox,
+    QListWidget, QListWidgetItem, QHBoxLayout, QProgressBar, QFrame, QToolButton, QPlainTextEdit
+)
+
+from PyQt5.QtCore import (
+    QEventLoop, QTimer, pyqtSlot, QObject, pyqtSignal,
+    QMetaObject, Q_ARG, Qt, QThread, QSize,
+    QAbstractListModel, QModelIndex, QEvent, QAbstractEventDispatcher
+    )
+
+from PyQt5.QtGui import QPixmap, QPalette, QColor, QImage, QImageReader, QIcon, QTextCursor, QFontDatabase
+from PyQt5 import sip
+from concurrent.futures import Future, CancelledError
+from functools import partial, wraps
+from operator import itemgetter
+from types import MethodType
+from typing import Optional, List, Union, Callable, Any, Tuple, Dict, Sequence, NamedTuple, Iterator, Set
+from collections import deque, OrderedDict
+import itertools
+import codecs
+import mmap
+import math
+import threading
+import bisect
+import heapq
+import json
+import re
+import keyword
+import time
+import sys
+import os
+
+from qt_user_massages_client import DialogClient, DIALOGS_REQUEST, encode_message, decode_message
+
+def QSleep(sec:float, callback:Optional[Callable[[], None]] = None):
+    """
+    This function will sleep the thread for the specified time.
+    A thread with a Qt event dispatcher keeps processing its events meanwhile, in a nested event loop.
+    With a `callback` nothing waits or nests: the function returns right away and the event loop
+    of the calling thread runs the callback once the time is up.
+
+    :param sec: The time in seconds to sleep the thread.
+    :param callback: Called after the time instead of sleeping <Optional>.
+    """
+    if callback is not None:
+        QTimer.singleShot(int(sec * 1000), callback)
+        return
+
+    # A thread without a dispatcher has no events to process, e.g. a plain Python thread
+    if QAbstractEventDispatcher.instance() is None:
+        time.sleep(sec)
+        return
+
+    loop = QEventLoop()
+    QTimer.singleShot(int(sec * 1000), loop.quit)
+    loop.exec_()
+
+def get_active_window():
+    """
+    Get the active window in the application.
+    """
+    return QApplication.activeWindow()
+
+# Process-wide (QStyle, QPalette) per (style name, background color), shared by all handlers
+_STYLE_CACHE: Dict[Tuple[Optional[str], Optional[str]], Tuple[Optional[QStyle], Optional[QPalette]]] = {}
+_STYLE_CACHE_LOCK = threading.Lock()
+
+def _get_cached_style(style:Optional[str], bg_color:Optional[str]) -> Tuple[Optional[QStyle], Optional[QPalette]]:
+    """
+    Get the shared style and palette for a style name and background color, creating them on first use.
+
+    :param style: The style name, based on the available styles in QStyleFactory.
+    :param bg_color: The background color <Optional>.
+
+    :return: The style (None if unknown) and the palette carrying the background color
+             (None if no valid color was given).
+    """
+    key = (style, bg_color)
+    with _STYLE_CACHE_LOCK:
+        cached = _STYLE_CACHE.get(key)
+        # The style dies with the QApplication that created it, a new one needs its own
+        if cached is not None and (cached[0] is None or not sip.isdeleted(cached[0])): return cached
+
+        qstyle = QStyleFactory.create(style) if style else None
+        palette = None
+
+        color = QColor(bg_color) if bg_color else QColor()
+        if qstyle is not None and color.isValid():
+            # The palette equivalent of a `background-color` stylesheet on the dialog and its children
+            palette = qstyle.standardPalette()
+            for role in (QPalette.ColorRole.Window, QPalette.ColorRole.Base, QPalette.ColorRole.Button):
+                palette.setColor(role, color)
+
+        cached = _STYLE_CACHE[key] = (qstyle, palette)
+        return cached
+
+
+class _TokenBucket:
+    """
+    Token bucket rate limiter. Not thread-safe, the owner must hold its own lock.
+    """
+    def __init__(self, rate:float, burst:int) -> None:
+        """
+        :param rate: Tokens added per second.
+        :param burst: Maximum number of tokens that can be saved up.
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def take(self) -> bool:
+        """
+        Take a token if one is available.
+
+        :return: True if a token was taken.
+        """
+        self._refill()
+        if self._tokens < 1: return False
+
+        self._tokens -= 1
+        return True
+
+    def wait_time(self) -> float:
+        """
+        :return: The time in seconds until the next token is available.
+        """
+        self._refill()
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+
+class _DetailText:
+    """
+    The full text of a message too long for a message box, read in chunks by its details view
+    only once the user expands it. Keeps a reference to the string of the caller, nothing is copied,
+    and/or the path of a file, mapped into memory while it is read after the text.
+    """
+    __slots__ = ("text", "path")
+
+    # Characters (or bytes of a file) per chunk
+    CHUNK = 64 * 1024
+
+    def __init__(self, text:Optional[str] = None, path:Optional[str] = None) -> None:
+        self.text = text
+        self.path = path
+
+    @property
+    def key(self) -> tuple:
+        """
+        Tells identical details apart from others, for the storm protection.
+        """
+        return (self.path, hash(self.text) if self.text is not None else None)
+
+    def chunks(self) -> Iterator[str]:
+        if self.text is not None:
+            for start in range(0, len(self.text), self.CHUNK):
+                yield self.text[start:start + self.CHUNK]
+        if self.path is None: return
+        if self.text: yield "\n\n"
+
+        try:
+            with open(self.path, "rb") as file:
+                if os.fstat(file.fileno()).st_size == 0: return
+
+                decoder = codecs.getincrementaldecoder("utf-8")("replace")
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    for start in range(0, len(data), self.CHUNK):
+                        yield decoder.decode(data[start:start + self.CHUNK])
+                    yield decoder.decode(b"", final=True)
+        except OSError as exc:
+            yield f"Failed to read {self.path}: {exc}"
+
+
+def _shorten(text:str, start:int, end:int, max_chars:int) -> str:
+    if end - start <= max_chars: return text[start:end]
+    return text[start:start + max_chars] + "\u2026"
+
+
+def _summarize(text:str, max_lines:int, max_chars:int = 200) -> str:
+    """
+    Summarize a long text by its first lines and its last line, e.g. the exception of a traceback,
+    each shortened to `max_chars`. Only looks at the lines it keeps, besides counting the others.
+    """
+    lines = []
+    start = 0
+    while len(lines) < max_lines and start < len(text):
+        end = text.find("\n", start)
+        if end < 0: end = len(text)
+        lines.append(_shorten(text, start, end, max_chars))
+        start = end + 1
+
+    # Ignore trailing line breaks
+    end = len(text)
+    while end > start and text[end - 1] in "\r\n":
+        end -= 1
+    if end <= start: return "\n".join(lines)
+
+    last_start = max(text.rfind("\n", start, end) + 1, start)
+    hidden = text.count("\n", start, last_start)
+    if hidden: lines.append(f"[\u2026 {hidden} more lines, see the details \u2026]")
+    lines.append(_shorten(text, last_start, end, max_chars))
+    return "\n".join(lines)
+
+
+class _CoalescedMessage:
+    """
+    A single info/warning/error dialog shared by every duplicate call merged into it.
+    """
+    def __init__(self, kind:str, title:str, content:str, ok_text:str,
+                 details:Optional[_DetailText] = None) -> None:
+        self.kind = kind
+        self.title = title
+        self.content = content
+        self.ok_text = ok_text
+        self.details = details
+        self.count = 1
+        self.last_seen = time.monotonic()
+        self.refresh_queued = False
+        # Only touched in the main thread
+        self.box: Optional[QMessageBox] = None
+        # Resolved with the occurrence count once the dialog is closed (or dropped)
+        self.closed = Future()
+
+    @property
+    def key(self) -> tuple:
+        key = (self.kind, self.title, self.content, self.ok_text)
+        # Different texts may have the same summary
+        return key + self.details.key if self.details is not None else key
+
+
+class _MessageCoalescer:
+    """
+    Thread-safe bookkeeping that merges duplicate messages and rate limits them per category.
+    """
+    SHOW = "show"
+    MERGED = "merged"
+    QUEUED = "queued"
+    DROPPED = "dropped"
+
+    def __init__(self, window:float, rate:float, burst:int, max_backlog:int) -> None:
+        """
+        :param window: Duplicates arriving within this many seconds of the last occurrence are merged.
+        :param rate: Dialogs per second allowed for each category.
+        :param burst: Number of dialogs per category that may be shown back to back.
+        :param max_backlog: Maximum number of rate limited dialogs waiting to be shown.
+        """
+        self.window = window
+        self.rate = rate
+        self.burst = burst
+        self.max_backlog = max_backlog
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._open: Dict[tuple, _CoalescedMessage] = {}
+        self._backlog = deque()
+        self._buckets: Dict[str, _TokenBucket] = {}
+
+    def _bucket(self, kind:str) -> _TokenBucket:
+        bucket = self._buckets.get(kind)
+        if bucket is None:
+            bucket = self._buckets[kind] = _TokenBucket(self.rate, self.burst)
+        return bucket
+
+    def post(self, kind:str, title:str, content:str, ok_text:str,
+             details:Optional[_DetailText] = None) -> Tuple[_CoalescedMessage, str]:
+        """
+        Register a message.
+
+        :return: The dialog the message belongs to and what the caller has to do with it:
+                 SHOW a new dialog, MERGED into an existing one, QUEUED in the backlog or DROPPED.
+        """
+        now = time.monotonic()
+        entry = _CoalescedMessage(kind, title, content, ok_text, details)
+
+        with self._lock:
+            existing = self._open.get(entry.key)
+            if existing is not None and now - existing.last_seen <= self.window:
+                existing.count += 1
+                existing.last_seen = now
+                return existing, self.MERGED
+
+            if self._bucket(kind).take():
+                self._open[entry.key] = entry
+                return entry, self.SHOW
+
+            if len(self._backlog) >= self.max_backlog:
+                self.dropped += 1
+                entry.closed.set_result(0)
+                return entry, self.DROPPED
+
+            self._open[entry.key] = entry
+            self._backlog.append(entry)
+            return entry, self.QUEUED
+
+    def request_refresh(self, entry:_CoalescedMessage) -> bool:
+        """
+        :return: True if the caller should queue a count refresh of the shown dialog.
+        """
+        with self._lock:
+            if entry.refresh_queued or entry.closed.done(): return False
+            entry.refresh_queued = True
+            return True
+
+    def take_count(self, entry:_CoalescedMessage) -> int:
+        """
+        Read the occurrence count of a dialog and allow the next refresh to be queued.
+        """
+        with self._lock:
+            entry.refresh_queued = False
+            return entry.count
+
+    def pop_ready(self) -> Tuple[List[_CoalescedMessage], Optional[float]]:
+        """
+        Take every backlogged dialog whose category has a token available.
+
+        :return: The dialogs to show now, and the delay in seconds before the backlog
+                 should be checked again (None if the backlog is empty).
+        """
+        ready = []
+        with self._lock:
+            for entry in list(self._backlog):
+                if self._bucket(entry.kind).take():
+                    self._backlog.remove(entry)
+                    ready.append(entry)
+
+            if not self._backlog: return ready, None
+            return ready, min(self._bucket(entry.kind).wait_time() for entry in self._backlog)
+
+    def close(self, entry:_CoalescedMessage) -> None:
+        """
+        Mark a dialog as closed and release everyone waiting on it.
+        """
+        with self._lock:
+            if self._open.get(entry.key) is entry:
+                del self._open[entry.key]
+            count = entry.count
+            # Shutting down may have released it already
+            if entry.closed.done(): return
+
+        entry.closed.set_result(count)
+
+    def close_all(self) -> None:
+        """
+        Close every shown and backlogged dialog, e.g. when the handler shuts down.
+        """
+        with self._lock:
+            entries = list(self._open.values())
+            self._backlog.clear()
+
+        for entry in entries:
+            self.close(entry)
+
+
+class _OptionIndex:
+    """
+    Case-insensitive prefix and substring index over a sequence of options.
+    Built once in the calling thread, then only read by the main thread.
+    """
+    def __init__(self, options:Sequence[str]) -> None:
+        keys = [str(option).casefold().replace("\n", " ") for option in options]
+
+        # Option indices sorted by key, for prefix lookups with bisect
+        self._order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._sorted_keys = [keys[i] for i in self._order]
+
+        # All keys in one string, so that substring lookups run in str.find
+        self._starts = []
+        offset = 0
+        for key in keys:
+            self._starts.append(offset)
+            offset += len(key) + 1
+        self._text = "\n".join(keys)
+
+    def match(self, query:str) -> List[int]:
+        """
+        Find the options containing `query`, ignoring case.
+
+        :return: The option indices, those starting with `query` first, each group in the original order.
+        """
+        query = query.casefold().replace("\n", " ")
+
+        lo = bisect.bisect_left(self._sorted_keys, query)
+        hi = bisect.bisect_left(self._sorted_keys, query + "\U0010ffff", lo)
+        prefix = sorted(self._order[lo:hi])
+        seen = set(prefix)
+
+        rest = []
+        pos = self._text.find(query)
+        while pos != -1:
+            i = bisect.bisect_right(self._starts, pos) - 1
+            if i not in seen: rest.append(i)
+            if i + 1 >= len(self._starts): break
+            # Continue with the next option
+            pos = self._text.find(query, self._starts[i + 1])
+
+        return prefix + rest
+
+
+class _LazyListModel(QAbstractListModel):
+    """
+    List model over a sequence of options that is shared, not copied.
+    Rows are read from the sequence only when the view fetches them, in batches.
+    """
+    BATCH_SIZE = 256
+
+    def __init__(self, options:Sequence[str], parent:Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._options = options
+        # Option indices of the rows when filtered, None shows every option
+        self._rows: Optional[List[int]] = None
+        self._loaded = min(self.BATCH_SIZE, len(options))
+
+    def _total(self) -> int:
+        return len(self._rows) if self._rows is not None else len(self._options)
+
+    def option_index(self, row:int) -> int:
+        """
+        :return: The index in the options of the given row.
+        """
+        return self._rows[row] if self._rows is not None else row
+
+    def set_rows(self, rows:Optional[List[int]]) -> None:
+        """
+        Show only the options with the given indices, or every option if None.
+        """
+        self.beginResetModel()
+        self._rows = rows
+        self._loaded = min(self.BATCH_SIZE, self._total())
+        self.endResetModel()
+
+    def rowCount(self, parent:QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded
+
+    def data(self, index:QModelIndex, role:int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        return str(self._options[self.option_index(index.row())])
+
+    def canFetchMore(self, parent:QModelIndex) -> bool:
+        return not parent.isValid() and self._loaded < self._total()
+
+    def fetchMore(self, parent:QModelIndex) -> None:
+        count = min(self.BATCH_SIZE, self._total() - self._loaded)
+        if count <= 0: return
+
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+
+class _ImageCache:
+    """
+    Thread-safe LRU cache of decoded images, bounded by their total size in bytes.
+    Each path keeps one image, replaced when the file changes.
+    """
+    def __init__(self, max_bytes:int) -> None:
+        """
+        :param max_bytes: Maximum total size of the cached images in bytes.
+        """
+        self.max_bytes = max_bytes
+        self._images: "OrderedDict[str, Tuple[tuple, QImage]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, path:str, stamp:tuple) -> Optional[QImage]:
+        """
+        :param path: The absolute path of the image file.
+        :param stamp: The file modification time and size when it was decoded.
+
+        :return: The cached image, or None if it is missing or the file changed.
+        """
+        with self._lock:
+            cached = self._images.get(path)
+            if cached is None or cached[0] != stamp: return None
+
+            self._images.move_to_end(path)
+            return cached[1]
+
+    def put(self, path:str, stamp:tuple, image:QImage) -> None:
+        """
+        Cache an image, evicting the least recently used ones to stay within the budget.
+        Images larger than the whole budget are not cached.
+        """
+        cost = image.sizeInBytes()
+        if cost > self.max_bytes: return
+
+        with self._lock:
+            old = self._images.pop(path, None)
+            if old is not None: self._bytes -= old[1].sizeInBytes()
+
+            self._images[path] = (stamp, image)
+            self._bytes += cost
+
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._images.popitem(last=False)
+                self._bytes -= evicted.sizeInBytes()
+
+
+class _DialogPool:
+    """
+    Pre-built and pre-styled message boxes, kept per dialog kind for reuse.
+    Only used from the main thread.
+    """
+    def __init__(self, size:int, factory:Callable[[str], QMessageBox]) -> None:
+        """
+        :param size: Maximum number of idle dialogs kept per kind.
+        :param factory: Callable that builds a new dialog of the given kind.
+        """
+        self.size = size
+        self._factory = factory
+        self._free: Dict[str, List[QMessageBox]] = {}
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+
+    def warm(self, kinds) -> None:
+        """
+        Fill the pool of every given kind up to its size.
+        """
+        for kind in kinds:
+            free = self._free.setdefault(kind, [])
+            while len(free) < self.size:
+                free.append(self._factory(kind))
+
+    def acquire(self, kind:str) -> QMessageBox:
+        """
+        Take an idle dialog of the given kind, or build a new one if none is left.
+        """
+        free = self._free.get(kind)
+        while free:
+            box = free.pop()
+            # The dialog may have been destroyed along with a parent window
+            if not sip.isdeleted(box):
+                self._hits[kind] = self._hits.get(kind, 0) + 1
+                return box
+
+        self._misses[kind] = self._misses.get(kind, 0) + 1
+        return self._factory(kind)
+
+    def release(self, kind:str, box:QMessageBox) -> bool:
+        """
+        Return a dialog to the pool.
+
+        :return: False if the pool of this kind is full and the dialog was not kept.
+        """
+        free = self._free.setdefault(kind, [])
+        if len(free) >= self.size: return False
+
+        free.append(box)
+        return True
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        :return: The hits, misses and idle dialogs per kind.
+        """
+        kinds = set(self._free) | set(self._hits) | set(self._misses)
+        return {kind: {"hits": self._hits.get(kind, 0),
+                       "misses": self._misses.get(kind, 0),
+                       "idle": len(self._free.get(kind, ()))}
+                for kind in kinds}
+
+
+class _DialogLedger:
+    """
+    Counts the dialogs a handler built and those destroyed since, per dialog kind.
+    A dialog is counted as destroyed when Qt deletes it, from its `destroyed` signal.
+    Only the main thread counts, any thread may read the stats.
+    """
+    # Dynamic property marking the dialogs counted already, e.g. pooled ones shown again
+    KIND_PROPERTY = "dialog_kind"
+
+    def __init__(self) -> None:
+        self._created: Dict[str, int] = {}
+        self._destroyed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def track(self, kind:str, dialog:QWidget) -> None:
+        if dialog.property(self.KIND_PROPERTY) is not None: return
+
+        dialog.setProperty(self.KIND_PROPERTY, kind)
+        with self._lock:
+            self._created[kind] = self._created.get(kind, 0) + 1
+        # Must not hold a reference to the dialog itself
+        dialog.destroyed.connect(partial(self._on_destroyed, kind))
+
+    def _on_destroyed(self, kind:str, *_) -> None:
+        with self._lock:
+            self._destroyed[kind] = self._destroyed.get(kind, 0) + 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        :return: The dialogs created, destroyed and still alive per kind.
+        """
+        with self._lock:
+            return {kind: {"created": created,
+                           "destroyed": self._destroyed.get(kind, 0),
+                           "alive": created - self._destroyed.get(kind, 0)}
+                    for kind, created in self._created.items()}
+
+
+class DialogQueueFull(RuntimeError):
+    """
+    Raised when the dialog queue is full and the overflow policy is "reject".
+    """
+
+
+class _DialogScheduler:
+    """
+    Thread-safe priority queue of pending dialogs with a bounded capacity.
+    Lower priority values are shown first, equal priorities in submission order.
+    """
+    BLOCK = "block"
+    DROP = "drop"
+    REJECT = "reject"
+
+    def __init__(self, max_visible:int, capacity:int, overflow:str) -> None:
+        """
+        :param max_visible: Maximum number of dialogs shown at the same time.
+        :param capacity: Maximum number of dialogs waiting to be shown.
+        :param overflow: What to do when the queue is full: "block", "drop" or "reject".
+        """
+        if overflow not in (self.BLOCK, self.DROP, self.REJECT):
+            raise ValueError(f"Unknown overflow policy: {overflow!r}")
+
+        self.max_visible = max_visible
+        self.capacity = capacity
+        self.overflow = overflow
+        self.visible = 0
+        self.closed = False
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def _purge_cancelled(self) -> None:
+        self._heap = [item for item in self._heap if not item[2][0].cancelled()]
+        heapq.heapify(self._heap)
+
+    def put(self, priority:int, request:tuple, wait:bool) -> bool:
+        """
+        Queue a request of (future, call, convert).
+
+        :param priority: The priority of the request, lower is shown first.
+        :param request: The request to queue.
+        :param wait: Whether the caller may wait for room when the policy is "block".
+                     Callers that may not wait are queued beyond the capacity.
+
+        :return: False if the request was dropped or the scheduler is closed.
+        """
+        with self._cond:
+            if self.closed: return False
+            if len(self._heap) >= self.capacity: self._purge_cancelled()
+
+            if len(self._heap) >= self.capacity:
+                if self.overflow == self.REJECT:
+                    raise DialogQueueFull(f"Dialog queue is full ({self.capacity} pending)")
+                if self.overflow == self.DROP:
+                    return False
+                if wait:
+                    self._cond.wait_for(lambda: self.closed or len(self._heap) < self.capacity)
+                    if self.closed: return False
+
+            heapq.heappush(self._heap, (priority, next(self._seq), request))
+            return True
+
+    def acquire(self) -> Optional[tuple]:
+        """
+        Take the most urgent request if another dialog may be shown.
+
+        :return: The request, or None if the queue is empty or too many dialogs are visible.
+        """
+        with self._cond:
+            if not self._heap or self.visible >= self.max_visible: return None
+
+            self.visible += 1
+            request = heapq.heappop(self._heap)[2]
+            self._cond.notify()
+            return request
+
+    def release(self) -> None:
+        """
+        Mark a dialog taken with `acquire` as closed.
+        """
+        with self._cond:
+            self.visible -= 1
+
+    def close(self) -> None:
+        """
+        Cancel every queued request and refuse new ones, releasing the callers waiting for room.
+        """
+        with self._cond:
+            self.closed = True
+            for item in self._heap:
+                item[2][0].cancel()
+            self._heap = []
+            self._cond.notify_all()
+
+
+class DialogPrompt(NamedTuple):
+    """
+    A dialog answered by the `HeadlessBackend`.
+    """
+    kind: str
+    title: str
+    content: str
+    # The remaining arguments of the dialog, e.g. button texts or options
+    fields: Dict[str, Any]
+    thread: str
+    time: float
+    answer: Any = None
+
+
+class HeadlessBackend:
+    """
+    Answers every dialog from a policy instead of showing it, for unattended and CI runs.
+    A handler using it creates no QApplication and no widgets.
+
+    The answer of a prompt is taken from the first of these that applies:
+      1. `responder`, a callable receiving the `DialogPrompt`.
+      2. `rules`, the first (title regex, answer) pair whose regex is found in the title.
+         The answer may also be a dict of answers per dialog kind, or a callable receiving the prompt.
+      3. `answers`, a dict of answers per dialog kind.
+      4. The default: Yes, the Yes button, the first option.
+
+    The dialog kinds are "yes_no", "yes_no_continue", "info", "warning", "error", "combo_box",
+    "filtered_combo_box", "instruction", "yes_no_batch" and "progress" (recorded, never answered). Answers for "yes_no_continue" may be the button text,
+    its index or "yes"/"no"/"continue". Answers for combo boxes may be the option or its index.
+    Answers for "yes_no_batch" may be one answer for every item or a list with exactly one answer per item.
+    Registered dialog kinds get the answer unchanged.
+    """
+    def __init__(self,
+                 answers: Optional[Dict[str, Any]] = None,
+                 rules: Optional[List[Tuple[str, Any]]] = None,
+                 responder: Optional[Callable[[DialogPrompt], Any]] = None,
+                 max_records: Optional[int] = 10000) -> None:
+        """
+        :param answers: Answers per dialog kind <Optional>.
+        :param rules: List of (title regex, answer) pairs, checked in order <Optional>.
+        :param responder: Callable returning the answer of a prompt, None falls through to the rules <Optional>.
+        :param max_records: Number of answered prompts kept in `prompts`. Default is 10000, None keeps all.
+        """
+        self.answers = dict(answers or {})
+        self.rules = [(re.compile(pattern), answer) for pattern, answer in (rules or [])]
+        self.responder = responder
+        self.prompts = deque(maxlen=max_records)
+
+    def respond(self, kind:str, title:str, content:str, **fields) -> Any:
+        """
+        Answer a dialog and record it.
+
+        :return: The answer, in the form the matching `MessageBoxHandler` method returns.
+        """
+        prompt = DialogPrompt(kind, title, content, fields, threading.current_thread().name, time.time())
+        answer = self._normalize(prompt, self._choose(prompt))
+        self.prompts.append(prompt._replace(answer=answer))
+        return answer
+
+    def _choose(self, prompt:DialogPrompt) -> Any:
+        if self.responder is not None:
+            answer = self.responder(prompt)
+            if answer is not None: return answer
+
+        for pattern, answer in self.rules:
+            if not pattern.search(prompt.title): continue
+
+            if isinstance(answer, dict):
+                if prompt.kind not in answer: continue
+                answer = answer[prompt.kind]
+            return answer(prompt) if callable(answer) else answer
+
+        return self.answers.get(prompt.kind)
+
+    @staticmethod
+    def _normalize(prompt:DialogPrompt, answer:Any) -> Any:
+        fields = prompt.fields
+
+        if prompt.kind == "yes_no":
+            return True if answer is None else bool(answer)
+
+        if prompt.kind == "yes_no_continue":
+            buttons = (fields["button_yes"], fields["button_no"], fields["button_continue"])
+            if answer is None: return buttons[0]
+            if isinstance(answer, int): return buttons[answer]
+            if answer in buttons: return answer
+
+            symbolic = ("yes", "no", "continue")
+            if str(answer).lower() in symbolic: return buttons[symbolic.index(str(answer).lower())]
+            raise ValueError(f"Invalid answer {answer!r} for buttons {buttons}")
+
+        if prompt.kind in ("combo_box", "filtered_combo_box"):
+            options = fields["options"]
+            if answer is None: return options[0] if len(options) else None
+            if isinstance(answer, int): return options[answer]
+            return answer
+
+        if prompt.kind == "yes_no_batch":
+            items = fields["items"]
+            if answer is None or isinstance(answer, bool): return [answer is not False] * len(items)
+
+            answers = [bool(item_answer) for item_answer in answer]
+            if len(answers) != len(items):
+                raise ValueError(f"{len(answers)} answers for {len(items)} items")
+            return answers
+
+        if prompt.kind in ("info", "warning", "error", "instruction", "progress"): return None
+
+        # Dialogs registered with `MessageBoxHandler.register_dialog` get the answer as it is
+        return answer
+
+
+class DialogTiming:
+    """
+    Timestamps (`time.perf_counter`) of the phases of one dialog.
+    Phases a dialog never reached are None.
+    """
+    __slots__ = ("kind", "thread", "called", "started", "built", "shown", "closed")
+
+    def __init__(self, kind:Optional[str], thread:str, called:float) -> None:
+        """
+        :param kind: The dialog kind, e.g. "yes_no".
+        :param thread: The name of the calling thread.
+        :param called: When the dialog was requested.
+        """
+        self.kind = kind
+        self.thread = thread
+        self.called = called
+        self.started = None
+        self.built = None
+        self.shown = None
+        self.closed = None
+
+    @staticmethod
+    def _span(start:Optional[float], end:Optional[float]) -> Optional[float]:
+        return end - start if start is not None and end is not None else None
+
+    @property
+    def queue_wait(self) -> Optional[float]:
+        """Seconds from the request until the main thread started the dialog."""
+        return self._span(self.called, self.started)
+
+    @property
+    def construction(self) -> Optional[float]:
+        """Seconds spent building and styling the dialog."""
+        return self._span(self.started, self.built)
+
+    @property
+    def time_to_show(self) -> Optional[float]:
+        """Seconds from the built dialog until it was first painted."""
+        return self._span(self.built, self.shown)
+
+    @property
+    def response(self) -> Optional[float]:
+        """Seconds the user took to answer the shown dialog."""
+        return self._span(self.shown if self.shown is not None else self.built, self.closed)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "thread": self.thread,
+                **{phase: getattr(self, phase) for phase in DialogMetrics.PHASES}}
+
+
+class _FirstPaintFilter(QObject):
+    """
+    Event filter recording when a dialog is painted for the first time.
+    """
+    def __init__(self, timing:DialogTiming, parent:QWidget) -> None:
+        super().__init__(parent)
+        self._timing = timing
+
+    def eventFilter(self, obj, event) -> bool:
+        if event.type() == QEvent.Type.Paint and self._timing.shown is None:
+            self._timing.shown = time.perf_counter()
+        return False
+
+
+def _label_value(value:Any) -> str:
+    """
+    Escape a label value for the Prometheus text format: backslash, double quote and line feed.
+    """
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class DialogMetrics:
+    """
+    Thread-safe registry of dialog timings: counters per dialog kind and calling thread,
+    and latency histograms per phase and dialog kind. Pass it to `MessageBoxHandler(metrics=...)`.
+    """
+    PHASES = ("queue_wait", "construction", "time_to_show", "response")
+    BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+               2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+    def __init__(self, keep_last:int = 1000) -> None:
+        """
+        :param keep_last: Number of most recent `DialogTiming` kept in `recent`. Default is 1000.
+        """
+        self.recent = deque(maxlen=keep_last)
+        self._hooks: List[Callable[[DialogTiming], None]] = []
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[str, str], int] = {}
+        # (phase, kind) -> [count per bucket (+Inf last), sum, count]
+        self._histograms: Dict[Tuple[str, str], list] = {}
+
+    def add_hook(self, hook:Callable[[DialogTiming], None]) -> None:
+        """
+        Call `hook` with the `DialogTiming` of every closed dialog.
+        Hooks run in the main thread and should return quickly.
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook:Callable[[DialogTiming], None]) -> None:
+        self._hooks.remove(hook)
+
+    def record(self, timing:DialogTiming) -> None:
+        """
+        Add the timing of a closed dialog to the registry and pass it to the hooks.
+        """
+        with self._lock:
+            key = (timing.kind, timing.thread)
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+            for phase in self.PHASES:
+                value = getattr(timing, phase)
+                if value is None: continue
+
+                histogram = self._histograms.get((phase, timing.kind))
+                if histogram is None:
+                    histogram = self._histograms[(phase, timing.kind)] = [[0] * (len(self.BUCKETS) + 1), 0.0, 0]
+
+                histogram[0][bisect.bisect_left(self.BUCKETS, value)] += 1
+                histogram[1] += value
+                histogram[2] += 1
+
+            self.recent.append(timing)
+
+        for hook in list(self._hooks):
+            hook(timing)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        :return: The counters and histograms as plain data. Histogram buckets are cumulative,
+                 keyed by their upper bound in seconds.
+        """
+        with self._lock:
+            counts = [{"kind": kind, "thread": thread, "count": count}
+                      for (kind, thread), count in sorted(self._counts.items())]
+            histograms = []
+            for (phase, kind), (buckets, total, count) in sorted(self._histograms.items()):
+                cumulative = list(itertools.accumulate(buckets))
+                histograms.append({"phase": phase, "kind": kind, "count": count, "sum": total,
+                                   "buckets": dict(zip([*map(str, self.BUCKETS), "+Inf"], cumulative))})
+
+        return {"dialogs": counts, "phases": histograms}
+
+    def to_json(self) -> str:
+        """
+        :return: The snapshot as JSON.
+        """
+        return json.dumps(self.snapshot())
+
+    def to_prometheus(self, prefix:str = "qt_dialog") -> str:
+        """
+        :param prefix: The prefix of the metric names. Default is "qt_dialog".
+
+        :return: The snapshot in the Prometheus text exposition format.
+        """
+        snapshot = self.snapshot()
+        lines = [f"# HELP {prefix}s_total Dialogs closed, per kind and calling thread.",
+                 f"# TYPE {prefix}s_total counter"]
+        for item in snapshot["dialogs"]:
+            labels = f'kind="{_label_value(item["kind"])}",thread="{_label_value(item["thread"])}"'
+            lines.append(f'{prefix}s_total{{{labels}}} {item["count"]}')
+
+        lines += [f"# HELP {prefix}_phase_seconds Duration of the dialog phases.",
+                  f"# TYPE {prefix}_phase_seconds histogram"]
+        for item in snapshot["phases"]:
+            labels = f'phase="{item["phase"]}",kind="{_label_value(item["kind"])}"'
+            for bound, count in item["buckets"].items():
+                lines.append(f'{prefix}_phase_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{prefix}_phase_seconds_sum{{{labels}}} {item['sum']}")
+            lines.append(f"{prefix}_phase_seconds_count{{{labels}}} {item['count']}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Returned by a dialog slot instead of its result when the dialog was closed by its timeout
+_TIMED_OUT = object()
+# Returned by a dialog slot that showed its dialog without waiting, the dialog completes the call once closed
+_PENDING = object()
+
+
+class _DialogContext:
+    """
+    State of one dialog call while it runs in the main thread: its timeout, its timing
+    and an optional checkbox added to the dialog, e.g. "Apply to all remaining".
+    The calling thread may read `timed_out` and `checked` once the call completed.
+    `on_done` is set for a call that doesn't wait for its dialog, see `MessageBoxHandler._await_dialog`.
+    """
+    # Signals connect to bound methods through weak references
+    __slots__ = ("timeout", "timing", "timed_out", "countdown", "paint_filter", "check_label", "check_box", "checked",
+                 "on_done", "kind", "__weakref__")
+
+    def __init__(self,
+                 timeout:Optional[float] = None,
+                 timing:Optional[DialogTiming] = None,
+                 check_label:Optional[str] = None) -> None:
+        self.timeout = timeout
+        self.timing = timing
+        self.timed_out = False
+        self.countdown = None
+        self.paint_filter = None
+        self.check_label = check_label
+        self.check_box = None
+        self.checked = False
+        # Called with (result, exception) once the dialog is closed
+        self.on_done: Optional[Callable[[Any, Optional[BaseException]], None]] = None
+        # The dialog kind, set by the dialog slot
+        self.kind: Optional[str] = None
+
+    def set_checked(self, checked:bool) -> None:
+        self.checked = checked
+
+    def release(self) -> None:
+        """
+        Stop the countdown, remove the paint filter and the checkbox of the closed dialog.
+        They are gone already if their dialog was deleted.
+        """
+        if self.check_box is not None and not sip.isdeleted(self.check_box):
+            owner = self.check_box.window()
+            # Pooled message boxes are reused without it
+            if isinstance(owner, QMessageBox): owner.setCheckBox(None)
+        self.check_box = None
+        # The user didn't choose the answer of a dialog that closed itself
+        if self.timed_out: self.checked = False
+
+        if self.countdown is not None and not sip.isdeleted(self.countdown):
+            self.countdown.stop()
+        self.countdown = None
+
+        if self.paint_filter is not None and not sip.isdeleted(self.paint_filter):
+            self.paint_filter.parent().removeEventFilter(self.paint_filter)
+            self.paint_filter.deleteLater()
+        self.paint_filter = None
+
+
+class _Countdown(QObject):
+    """
+    Closes a dialog when its timeout expires, showing the seconds left in its title.
+    """
+    def __init__(self, context:_DialogContext, dialog:QDialog) -> None:
+        super().__init__(dialog)
+        self._context = context
+        self._dialog = dialog
+        self._title = dialog.windowTitle()
+        self._deadline = time.monotonic() + context.timeout
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._tick)
+        self._tick()
+
+    def _tick(self) -> None:
+        remaining = self._deadline - time.monotonic()
+        if remaining <= 0:
+            self._context.timed_out = True
+            self.stop()
+            # Closing emits `finished`, which also ends the event loops of non-modal dialogs
+            self._dialog.done(QDialog.DialogCode.Rejected)
+            return
+
+        seconds = math.ceil(remaining)
+        self._dialog.setWindowTitle(f"{self._title} ({seconds} s)")
+        # Wake up again when the displayed number changes
+        self._timer.start(int((remaining - (seconds - 1)) * 1000) + 1)
+
+    def stop(self) -> None:
+        self._timer.stop()
+        self._dialog.setWindowTitle(self._title)
+        self.deleteLater()
+
+
+class ProgressHandle:
+    """
+    Thread-safe handle of a progress bar, see `MessageBoxHandler.progress_message`.
+    Any thread may update it at any rate: an update only stores the latest value, and the main thread
+    shows the latest values at a capped frame rate. A single attribute store is atomic, so there is no lock.
+
+        with handler.progress_message("Import", maximum=len(rows)) as progress:
+            for done, row in enumerate(rows, 1):
+                if progress.cancelled: break
+                import_row(row)
+                progress.update(done)
+    """
+    def __init__(self, title:str, content:str, maximum:Optional[float], cancellable:bool, button_cancel:str) -> None:
+        """
+        :param title: The title of the progress bar.
+        :param content: The text shown above the bar until `update` sets another one.
+        :param maximum: The value of a finished job, None or 0 shows a busy indicator.
+        :param cancellable: Whether the bar has a cancel button.
+        :param button_cancel: The text of the cancel button.
+        """
+        self.title = title
+        self.content = content
+        self.cancellable = cancellable
+        self.button_cancel = button_cancel
+        # The latest values, written by the workers and read by the main thread
+        self._value = 0
+        self._maximum = maximum
+        self._text = None
+        self._closed = False
+        self._cancelled = threading.Event()
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    @property
+    def maximum(self) -> Optional[float]:
+        return self._maximum
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        Whether the user cancelled the job, or `cancel` was called. The worker is expected to stop.
+        """
+        return self._cancelled.is_set()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def update(self, value:float, text:Optional[str] = None) -> None:
+        """
+        Set the progress, from any thread.
+
+        :param value: The progress, between 0 and `maximum`.
+        :param text: A new text to show above the bar <Optional>.
+        """
+        self._value = value
+        if text is not None: self._text = text
+
+    def advance(self, step:float = 1, text:Optional[str] = None) -> None:
+        """
+        Add to the progress. Not atomic, threads sharing a bar should count themselves and call `update`.
+        """
+        self.update(self._value + step, text)
+
+    def set_maximum(self, maximum:Optional[float]) -> None:
+        """
+        Change the value of a finished job, e.g. once it is known. None or 0 shows a busy indicator.
+        """
+        self._maximum = maximum
+
+    def wait_cancelled(self, timeout:Optional[float] = None) -> bool:
+        """
+        Wait until the job is cancelled.
+
+        :return: Whether it was cancelled.
+        """
+        return self._cancelled.wait(timeout)
+
+    def cancel(self) -> None:
+        """
+        Cancel the job, like the cancel button.
+        """
+        self._cancelled.set()
+
+    def close(self) -> None:
+        """
+        Remove the bar. The progress window closes with its last bar.
+        """
+        self._closed = True
+
+    def __enter__(self) -> "ProgressHandle":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _format_duration(seconds:float) -> str:
+    """
+    Format seconds as m:ss, or h:mm:ss from an hour on.
+    """
+    minutes, seconds = divmod(int(seconds + 0.5), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+class _ProgressRow:
+    """
+    The widgets of one progress bar in the `_ProgressWindow`, and its throughput estimate.
+    """
+    __slots__ = ("widget", "label", "bar", "stats", "button", "shown", "rate", "sample")
+
+    # Range of the bar, values are scaled to it so that any maximum fits into an int
+    STEPS = 1000
+    # Weight of the newest throughput sample, the rest smooths out bursty updates
+    SMOOTHING = 0.3
+
+    def __init__(self, handle:ProgressHandle, now:float) -> None:
+        self.widget = QWidget()
+        layout = QVBoxLayout(self.widget)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.label = QLabel()
+        layout.addWidget(self.label)
+
+        bar_layout = QHBoxLayout()
+        self.bar = QProgressBar()
+        self.bar.setRange(0, self.STEPS)
+        bar_layout.addWidget(self.bar)
+
+        self.button = None
+        if handle.cancellable:
+            self.button = QPushButton(handle.button_cancel)
+            self.button.clicked.connect(handle.cancel)
+            bar_layout.addWidget(self.button)
+        layout.addLayout(bar_layout)
+
+        self.stats = QLabel()
+        layout.addWidget(self.stats)
+
+        # What the widgets show, to only touch them when something changed
+        self.shown = None
+        # Items per second, and the (time, value) it was last sampled at
+        self.rate = None
+        self.sample = (now, handle.value)
+
+    def refresh(self, handle:ProgressHandle, now:float) -> None:
+        """
+        Show the latest values of the handle.
+        """
+        value, maximum, text, cancelled = handle.value, handle.maximum, handle._text, handle.cancelled
+
+        sample_time, sample_value = self.sample
+        if now > sample_time:
+            rate = (value - sample_value) / (now - sample_time)
+            self.rate = rate if self.rate is None else self.rate + self.SMOOTHING * (rate - self.rate)
+            self.sample = (now, value)
+
+        stats = f"{value:g} / {maximum:g}" if maximum else f"{value:g}"
+        if self.rate is not None:
+            stats += f"    {self.rate:.1f}/s"
+            if maximum and self.rate > 0 and value < maximum:
+                stats += f"    ETA {_format_duration((maximum - value) / self.rate)}"
+        if cancelled: stats += "    Cancelling..."
+
+        shown = (value, maximum, text, cancelled, stats)
+        if shown == self.shown: return
+        self.shown = shown
+
+        label = text if text is not None else handle.content
+        self.label.setText(f"{handle.title}: {label}" if label else handle.title)
+        if maximum:
+            if self.bar.maximum() == 0: self.bar.setRange(0, self.STEPS)
+            self.bar.setValue(int(max(0, min(value / maximum, 1)) * self.STEPS))
+        elif self.bar.maximum() != 0:
+            # Busy indicator
+            self.bar.setRange(0, 0)
+        self.stats.setText(stats)
+        if self.button is not None: self.button.setEnabled(not cancelled)
+
+
+class _ProgressWindow(QDialog):
+    """
+    Non-modal window with the progress bars of a handler, one row per `ProgressHandle`.
+    Lives in the main thread and redraws the rows from the latest values of their handles on a timer,
+    which only runs while there are bars.
+    """
+    def __init__(self, interval:int) -> None:
+        """
+        :param interval: Milliseconds between two redraws.
+        """
+        # Without a parent, it doesn't go away with the window that was active when it opened
+        super().__init__(None, Qt.WindowType.WindowStaysOnTopHint)
+        self.setWindowTitle("Progress")
+        self.setMinimumWidth(360)
+        self._layout = QVBoxLayout(self)
+        self._rows: Dict[ProgressHandle, _ProgressRow] = {}
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.refresh)
+
+    def add(self, handle:ProgressHandle) -> None:
+        row = _ProgressRow(handle, time.monotonic())
+        self._rows[handle] = row
+        self._layout.addWidget(row.widget)
+        self.refresh()
+
+        if self._rows:
+            self.show()
+            self._timer.start()
+
+    def refresh(self) -> None:
+        now = time.monotonic()
+        for handle, row in list(self._rows.items()):
+            if handle.closed:
+                del self._rows[handle]
+                self._layout.removeWidget(row.widget)
+                row.widget.deleteLater()
+            else:
+                row.refresh(handle, now)
+
+        if not self._rows:
+            self._timer.stop()
+            self.hide()
+            return
+
+        self.setWindowTitle(next(iter(self._rows)).title if len(self._rows) == 1 else f"Progress ({len(self._rows)})")
+        self.adjustSize()
+
+    def reject(self) -> None:
+        """
+        Closing the window cancels all its jobs. It stays open until their workers stopped.
+        """
+        for handle in self._rows:
+            handle.cancel()
+
+
+class Notification(NamedTuple):
+    """
+    A notification recorded in the history of a handler, see `MessageBoxHandler.notify`.
+    """
+    kind: str
+    title: str
+    content: str
+    # The calling thread, and when it was called (seconds since the epoch)
+    thread: str
+    time: float
+
+
+# Standard icon of every notification kind
+_NOTIFICATION_ICONS = {
+    "info": QStyle.StandardPixmap.SP_MessageBoxInformation,
+    "warning": QStyle.StandardPixmap.SP_MessageBoxWarning,
+    "error": QStyle.StandardPixmap.SP_MessageBoxCritical,
+}
+
+
+class _Toast(QFrame):
+    """
+    One notification of the `_ToastStack`. A stack owns a fixed set of them and refills them.
+    """
+    def __init__(self, on_close:Callable[["_Toast"], None]) -> None:
+        super().__init__()
+        self.setFrameShape(QFrame.Shape.StyledPanel)
+        self.setAutoFillBackground(True)
+        # When it closes by itself, None for never
+        self.expires: Optional[float] = None
+
+        layout = QHBoxLayout(self)
+        self.icon = QLabel()
+        layout.addWidget(self.icon, 0, Qt.AlignmentFlag.AlignTop)
+
+        text_layout = QVBoxLayout()
+        self.title = QLabel()
+        font = self.title.font()
+        font.setBold(True)
+        self.title.setFont(font)
+        self.content = QLabel()
+        self.content.setWordWrap(True)
+        for label in (self.title, self.content):
+            label.setTextFormat(Qt.TextFormat.PlainText)
+            text_layout.addWidget(label)
+        layout.addLayout(text_layout, 1)
+
+        close_button = QToolButton()
+        close_button.setText("\u2715")
+        close_button.setAutoRaise(True)
+        close_button.clicked.connect(lambda: on_close(self))
+        layout.addWidget(close_button, 0, Qt.AlignmentFlag.AlignTop)
+
+    def fill(self, icon:QPixmap, title:str, content:str, expires:Optional[float]) -> None:
+        self.icon.setPixmap(icon)
+        self.title.setText(title)
+        self.content.setText(content)
+        self.content.setVisible(bool(content))
+        self.expires = expires
+
+
+class _ToastStack(QWidget):
+    """
+    Non-modal stack of notifications in the bottom right corner of the screen, the newest at the bottom.
+    It has a fixed number of toasts: when they are all shown, a new notification takes the place
+    of the oldest one, which is then counted in a "+N more" button opening the history.
+    A single timer closes the toasts as they expire.
+    """
+    # Width of the toasts, and their distance to the screen edges, in pixels
+    WIDTH = 340
+    MARGIN = 12
+
+    def __init__(self, limit:int, icons:Dict[str, QPixmap], on_more:Callable[[], None]) -> None:
+        """
+        :param limit: The number of toasts shown at once.
+        :param icons: The icon of every notification kind.
+        :param on_more: Called when the "+N more" button is clicked.
+        """
+        super().__init__(None, Qt.WindowType.Tool | Qt.WindowType.FramelessWindowHint
+                         | Qt.WindowType.WindowStaysOnTopHint)
+        # Notifications must not take the focus from what the user is doing
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
+        self.setFixedWidth(self.WIDTH)
+        self._icons = icons
+
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._more = QPushButton()
+        self._more.setFlat(True)
+        self._more.clicked.connect(on_more)
+        self._more.hide()
+        self._layout.addWidget(self._more)
+
+        self._free = [_Toast(self.dismiss) for _ in range(limit)]
+        # The toasts shown, oldest first
+        self._shown: List[_Toast] = []
+        # The notifications pushed out of the stack since it was last empty
+        self._overflow = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._expire)
+
+    def add(self, notifications:List[Tuple[str, str, str, Optional[float]]], dropped:int = 0) -> None:
+        """
+        Show new notifications, given as (kind, title, content, seconds shown or None for until closed).
+
+        :param dropped: The number of notifications of the burst that never reached the stack.
+        """
+        limit = len(self._free) + len(self._shown)
+        # Of a burst, only the newest ones could stay on the stack anyway
+        self._overflow += dropped + max(0, len(notifications) - limit)
+
+        now = time.monotonic()
+        for kind, title, content, duration in notifications[-limit:]:
+            if self._free:
+                toast = self._free.pop()
+            else:
+                toast = self._shown.pop(0)
+                self._layout.removeWidget(toast)
+                self._overflow += 1
+
+            toast.fill(self._icons[kind], title, content, now + duration if duration else None)
+            self._layout.addWidget(toast)
+            toast.show()
+            self._shown.append(toast)
+
+        self._update()
+
+    def dismiss(self, toast:_Toast) -> None:
+        """
+        Close a toast before it expires.
+        """
+        if toast not in self._shown: return
+
+        self._shown.remove(toast)
+        self._layout.removeWidget(toast)
+        toast.hide()
+        self._free.append(toast)
+        self._update()
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for toast in [toast for toast in self._shown if toast.expires is not None and toast.expires <= now]:
+            self.dismiss(toast)
+        self._update()
+
+    def _update(self) -> None:
+        """
+        Update the "+N more" button, the expiry timer and the position of the stack.
+        """
+        if not self._shown:
+            self._overflow = 0
+            self._timer.stop()
+            self.hide()
+            return
+
+        self._more.setText(f"+{self._overflow} more")
+        self._more.setVisible(self._overflow > 0)
+
+        expiries = [toast.expires for toast in self._shown if toast.expires is not None]
+        if expiries:
+            self._timer.start(max(0, int((min(expiries) - time.monotonic()) * 1000)) + 1)
+        else:
+            self._timer.stop()
+
+        self.adjustSize()
+        screen = QApplication.primaryScreen()
+        if screen is not None:
+            corner = screen.availableGeometry().bottomRight()
+            self.move(corner.x() - self.width() - self.MARGIN, corner.y() - self.height() - self.MARGIN)
+        self.show()
+
+
+class _NotificationHistory(QDialog):
+    """
+    Non-modal viewer of the notification history of a handler, newest first.
+    """
+    def __init__(self, icons:Dict[str, QPixmap]) -> None:
+        super().__init__(None, Qt.WindowType.WindowStaysOnTopHint)
+        self.setWindowTitle("Notifications")
+        self.resize(480, 360)
+        self._icons = icons
+
+        layout = QVBoxLayout(self)
+        self._list = QListWidget()
+        self._list.setUniformItemSizes(True)
+        layout.addWidget(self._list)
+
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.close)
+        layout.addWidget(close_button)
+
+    def show_history(self, history:List[Notification]) -> None:
+        self._list.clear()
+        for notification in reversed(history):
+            stamp = time.strftime("%H:%M:%S", time.localtime(notification.time))
+            text = f"{stamp}  {notification.title}"
+            if notification.content: text += f": {notification.content}"
+            QListWidgetItem(QIcon(self._icons[notification.kind]), text, self._list)
+
+        self.show()
+        self.raise_()
+
+
+class _DetailsDialog(QDialog):
+    """
+    Message dialog for a text too long for a message box: shows a summary, and the full text in a
+    `QPlainTextEdit` once the user expands the details. The text is fed in chunks from the event loop,
+    and the plain text edit only lays out the lines in view.
+    """
+    SHOW_TEXT = "Show details"
+    HIDE_TEXT = "Hide details"
+
+    def __init__(self, parent:Optional[QWidget], icon:QPixmap, title:str, summary:str, ok_text:str,
+                 details:_DetailText) -> None:
+        super().__init__(parent, Qt.WindowType.WindowStaysOnTopHint)
+        self.setWindowTitle(title)
+        self._details = details
+        self._chunks = None
+
+        layout = QVBoxLayout(self)
+        top_layout = QHBoxLayout()
+        icon_label = QLabel()
+        icon_label.setPixmap(icon)
+        top_layout.addWidget(icon_label, 0, Qt.AlignmentFlag.AlignTop)
+
+        text_layout = QVBoxLayout()
+        self._text = QLabel(summary)
+        self._text.setTextFormat(Qt.TextFormat.PlainText)
+        self._text.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        text_layout.addWidget(self._text)
+        self._informative = QLabel()
+        self._informative.hide()
+        text_layout.addWidget(self._informative)
+        top_layout.addLayout(text_layout, 1)
+        layout.addLayout(top_layout)
+
+        self._view = QPlainTextEdit()
+        self._view.setReadOnly(True)
+        self._view.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self._view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self._view.hide()
+        layout.addWidget(self._view, 1)
+
+        button_layout = QHBoxLayout()
+        self._toggle = QPushButton(self.SHOW_TEXT)
+        self._toggle.setCheckable(True)
+        self._toggle.toggled.connect(self._show_details)
+        button_layout.addWidget(self._toggle)
+        button_layout.addStretch(1)
+        ok_button = QPushButton(ok_text)
+        ok_button.setDefault(True)
+        ok_button.clicked.connect(self.accept)
+        button_layout.addWidget(ok_button)
+        layout.addLayout(button_layout)
+
+        self._feed_timer = QTimer(self)
+        self._feed_timer.timeout.connect(self._feed)
+        self.finished.connect(self._stop_feed)
+
+    def setInformativeText(self, text:str) -> None:
+        """
+        Same as `QMessageBox.setInformativeText`, for the occurrence count of merged messages.
+        """
+        self._informative.setText(text)
+        self._informative.setVisible(bool(text))
+
+    def _show_details(self, shown:bool) -> None:
+        self._view.setVisible(shown)
+        self._toggle.setText(self.HIDE_TEXT if shown else self.SHOW_TEXT)
+        if shown:
+            self.resize(max(self.width(), 720), max(self.height(), 480))
+            # Start reading the text the first time only
+            if self._chunks is None:
+                self._chunks = self._details.chunks()
+                self._feed_timer.start(0)
+        else:
+            self.adjustSize()
+
+    def _feed(self) -> None:
+        """
+        Append the next chunk of the text, a chunk per pass of the event loop.
+        """
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._stop_feed()
+            return
+
+        cursor = QTextCursor(self._view.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(chunk)
+
+    def _stop_feed(self) -> None:
+        self._feed_timer.stop()
+        # Closes a mapped file
+        if self._chunks is not None: self._chunks.close()
+
+
+def _dialog_slot(kind:Union[str, Callable[..., str]]):
+    """
+    Decorator running a dialog slot with the context handed over by its caller, see `_hand_over`.
+    Records the timing of the dialog when the handler has metrics, and returns `_TIMED_OUT`
+    instead of the slot result when the dialog was closed by its timeout.
+    A slot returning `_PENDING` is finished by `MessageBoxHandler._await_dialog` once its dialog is closed.
+
+    :param kind: The dialog kind, or a callable taking the slot arguments and returning it.
+    """
+    def decorator(slot):
+        @wraps(slot)
+        def wrapper(self, *args):
+            context, self._handover = self._handover, None
+            if context is None: context = _DialogContext()
+            on_done, self._on_done = self._on_done, None
+            # A dialog with a timeout is completed by its `finished` signal, like the dialogs of a modeless handler:
+            # a loop of its own could only return once the dialogs shown after it were closed
+            if self.modeless or context.timeout is not None: context.on_done = on_done
+            context.kind = kind(*args) if callable(kind) else kind
+
+            timing = context.timing
+            if timing is None and self._metrics is not None:
+                timing = context.timing = DialogTiming(None, threading.current_thread().name, time.perf_counter())
+            if timing is not None:
+                timing.kind = context.kind
+                timing.started = time.perf_counter()
+
+            self._contexts.append(context)
+            try:
+                res = slot(self, *args)
+            except BaseException:
+                self._finish_context(context, None)
+                raise
+            finally:
+                self._contexts.pop()
+
+            if res is _PENDING: return res
+            return self._finish_context(context, res)
+        return wrapper
+    return decorator
+
+
+class AnswerCache:
+    """
+    Thread-safe cache of the answers a user asked to remember with the "Remember this choice" checkbox.
+    A question asked again with the same kind, title, content and buttons (or options) is then answered
+    from the cache, in the calling thread without touching Qt. Pass it to `MessageBoxHandler(answer_cache=...)`,
+    handlers sharing a cache share the remembered answers.
+
+    The keys are tuples (kind, title, content, choices), where choices are the button texts or the options.
+    Least recently used answers are evicted first.
+    """
+    _session = None
+    _session_lock = threading.Lock()
+
+    def __init__(self,
+                 max_entries:int = 1000,
+                 ttl:Optional[float] = None,
+                 label:str = "Remember this choice") -> None:
+        """
+        :param max_entries: The maximum number of remembered answers. Default is 1000.
+        :param ttl: Seconds an answer is remembered <Optional>. Default is None (until evicted).
+        :param label: The text of the checkbox.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.label = label
+        self.hits = 0
+        self.misses = 0
+        # key -> (answer, expiry time or None)
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def session(cls) -> "AnswerCache":
+        """
+        :return: The cache shared by every handler created with `answer_cache="session"`.
+        """
+        with cls._session_lock:
+            if cls._session is None: cls._session = cls()
+            return cls._session
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key:tuple, default:Any = None) -> Any:
+        """
+        :return: The remembered answer of a question, or `default` if there is none (anymore).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key:tuple, answer:Any) -> None:
+        """
+        Remember the answer of a question.
+        """
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (answer, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self,
+                   kind:Optional[str] = None,
+                   title:Optional[str] = None,
+                   content:Optional[str] = None) -> int:
+        """
+        Forget the remembered answers matching every given field, all of them if none is given.
+        The next matching questions are shown again.
+
+        :return: The number of forgotten answers.
+        """
+        with self._lock:
+            keys = [key for key in self._entries
+                    if (kind is None or key[0] == kind) and (title is None or key[1] == title)
+                    and (content is None or key[2] == content)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        :return: The remembered answers, least recently used first, with the seconds until they expire
+                 ("expires_in", None if they don't).
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [{"kind": kind, "title": title, "content": content, "choices": choices, "answer": answer,
+                     "expires_in": expires - now if expires is not None else None}
+                    for (kind, title, content, choices), (answer, expires) in self._entries.items()
+                    if expires is None or expires > now]
+
+
+# Marks a question without a remembered answer
+_NOT_REMEMBERED = object()
+
+
+class ApplyToAll:
+    """
+    Asks the questions of a per-item loop with an "Apply to all remaining" checkbox.
+    Once the user ticks it, the remaining questions of the same kind are answered the same way
+    right in the calling thread, without showing or dispatching anything. Create it with `MessageBoxHandler.apply_to_all`.
+    """
+    def __init__(self, handler:"MessageBoxHandler", label:str) -> None:
+        """
+        :param handler: The handler showing the questions.
+        :param label: The text of the checkbox.
+        """
+        self.label = label
+        # The answers applied to all remaining questions, per dialog kind
+        self.answers: Dict[str, Any] = {}
+        self._handler = handler
+
+    def yes_no_message(self,
+                       title="Title",
+                       content="Content",
+                       button_yes="Yes",
+                       button_no="No",
+                       timeout:Optional[float] = None,
+                       default:bool = False) -> bool:
+        """
+        See `MessageBoxHandler.yes_no_message`.
+        """
+        return self._ask("yes_no", partial(self._handler.yes_no_message, title, content, button_yes, button_no),
+                         self._handler._yes_no_message, (title, content, button_yes, button_no), None,
+                         timeout, default)
+
+    def yes_no_continue_message(self,
+                                title="Title",
+                                content="Content",
+                                button_yes="Yes",
+                                button_no="No",
+                                button_continue="Continue",
+                                timeout:Optional[float] = None,
+                                default:Optional[str] = None) -> str:
+        """
+        See `MessageBoxHandler.yes_no_continue_message`.
+        """
+        handler = self._handler
+        return self._ask("yes_no_continue",
+                         partial(handler.yes_no_continue_message, title, content, button_yes, button_no, button_continue),
+                         handler._yes_no_continue_message, (title, content, button_yes, button_no, button_continue),
+                         partial(handler._continue_button_text, button_yes=button_yes,
+                                 button_no=button_no, button_continue=button_continue),
+                         timeout, default)
+
+    def reset(self) -> None:
+        """
+        Forget the applied answers, the next questions are shown again.
+        """
+        self.answers.clear()
+
+    def _ask(self, kind:str, headless_call:Callable, slot:Callable, args:tuple,
+             convert:Optional[Callable[[Any], Any]], timeout:Optional[float], default:Any) -> Any:
+        if kind in self.answers: return self.answers[kind]
+
+        # Nobody can tick the checkbox of a headless dialog
+        if self._handler._backend is not None: return headless_call()
+
+        answer, checked = self._handler._ask_with_checkbox(self.label, slot, args, convert, timeout, default)
+        if checked: self.answers[kind] = answer
+        return answer
+
+
+class DialogSpec(NamedTuple):
+    """
+    Declares a dialog type. `MessageBoxHandler` generates its thread-safe public method `name`
+    and the asyncio variant "a" + `name` from it, see `MessageBoxHandler.register_dialog`.
+    """
+    # The name of the public method, e.g. "yes_no_message"
+    name: str
+    # The dialog kind seen by the headless backend, the metrics and the answer cache
+    kind: str
+    # Shows the dialog in the main thread and returns its raw result: show(handler, *arguments)
+    show: Callable[..., Any]
+    # The parameters of the dialog as (name, default) pairs, starting with title and content
+    params: Tuple[Tuple[str, Any], ...]
+    # The docstring of the public method
+    doc: str = ""
+    # Whether the dialog answers with a value, which gives the public method a `default` parameter
+    answers: bool = True
+    # The answer of a timed out dialog, unless the call passes its own `default`
+    default: Any = None
+    # The priority with the scheduler, lower is shown first
+    priority: int = 2
+    # Fixes up the parameter values in the calling thread, normalize(values) <Optional>
+    normalize: Optional[Callable[[Dict[str, Any]], None]] = None
+    # Builds the arguments of `show` in the calling thread, arguments(handler, values) <Optional>.
+    # By default the values of the parameters, in order.
+    arguments: Optional[Callable[[Any, Dict[str, Any]], tuple]] = None
+    # Makes the function mapping the raw result of `show` to the answer, convert(values) <Optional>
+    convert: Optional[Callable[[Dict[str, Any]], Callable[[Any], Any]]] = None
+    # The parameters a headless backend gets besides title and content, by default all of them <Optional>
+    headless: Optional[Tuple[str, ...]] = None
+    # Makes the buttons or options part of the answer cache key, remember(values) <Optional>.
+    # None: the answers are never remembered.
+    remember: Optional[Callable[[Dict[str, Any]], tuple]] = None
+    # Whether the dialog is an info/warning/error notice, merged by the storm protection
+    notice: bool = False
+    # Keyword-only parameters as (name, default) pairs, passed to `show` after `params`.
+    # A parameter added to an existing dialog goes here, so positional calls keep their meaning.
+    keyword_params: Tuple[Tuple[str, Any], ...] = ()
+
+
+class _DialogType:
+    """
+    A registered `DialogSpec` with what its calls need precomputed.
+    """
+    __slots__ = ("spec", "defaults", "params", "headless")
+
+    # The parameters every generated method ends with
+    CALL_PARAMS = (("block", True), ("as_future", False), ("timeout", None))
+
+    def __init__(self, spec:DialogSpec) -> None:
+        self.spec = spec
+        # The names of the parameters of `show`, in order
+        self.params = tuple(name for name, _ in spec.params + spec.keyword_params)
+        self.headless = self.params[2:] if spec.headless is None else spec.headless
+
+        # The parameters of the public method and their defaults, in order, the keyword-only ones last
+        self.defaults = dict(spec.params + self.CALL_PARAMS
+                             + ((("default", spec.default),) if spec.answers else ()) + spec.keyword_params)
+        for name in self.defaults:
+            if not name.isidentifier() or keyword.iskeyword(name):
+                raise ValueError(f"Invalid parameter name {name!r}")
+
+    def methods(self) -> Tuple[Callable[..., Any], Callable[..., Any]]:
+        """
+        Generate the public method of the dialog and its asyncio variant.
+        Like `dataclasses`, they are compiled from source, so Python binds their arguments
+        and they have a real signature.
+        """
+        name = self.spec.name
+        keyword_only = tuple(param for param, _ in self.spec.keyword_params)
+        positional = tuple(param for param in self.defaults if param not in keyword_only)
+        async_positional = tuple(param for param in positional if param not in ("block", "as_future"))
+        # A bare star makes the parameters after it keyword-only
+        star = ("*",) if keyword_only else ()
+
+        def signature(names:Tuple[str, ...]) -> str:
+            return ", ".join(param if param == "*" else f"{param}=_defaults[{param!r}]" for param in names)
+
+        params = signature(positional + star + keyword_only)
+        values = ", ".join(f"{param!r}: {param}" for param in self.defaults)
+        async_params = signature(async_positional + star + keyword_only)
+        async_args = ", ".join(f"{param}={param}" for param in async_positional + keyword_only)
+
+        source = (f"def {name}(self, {params}):\n"
+                  f"    return self._call_dialog(_dialog, {{{values}}})\n"
+                  f"async def a{name}(self, {async_params}):\n"
+                  f"    return await self._await_future(self.{name}({async_args}, as_future=True))\n")
+        namespace = {"_dialog": self, "_defaults": self.defaults}
+        exec(source, namespace)
+
+        method, async_method = namespace[name], namespace["a" + name]
+        method.__doc__ = self.spec.doc
+        async_method.__doc__ = f"""
+        Asyncio variant of `{name}`. Only the awaiting coroutine is suspended, no thread is blocked.
+        """
+        for function in (method, async_method):
+            function.__qualname__ = f"MessageBoxHandler.{function.__name__}"
+            function.__module__ = __name__
+        return method, async_method
+
+
+class _GuiThread(threading.Thread):
+    """
+    Thread creating the QApplication and running its event loop, see `MessageBoxHandler(gui_thread=True)`.
+    """
+    def __init__(self, on_exit:Callable[[], None]) -> None:
+        """
+        :param on_exit: Called in the thread once its event loop ended.
+        """
+        super().__init__(name="QtGuiThread", daemon=True)
+        self.app = None
+        # Guards `accepting`, so that nothing is queued once the event loop ended
+        self.lock = threading.Lock()
+        self.accepting = True
+        self._on_exit = on_exit
+        self._ready = threading.Event()
+        self._error = None
+
+    def start_and_wait(self) -> QApplication:
+        """
+        Start the thread and wait until its QApplication exists.
+        """
+        self.start()
+        self._ready.wait()
+        if self._error is not None: raise self._error
+        return self.app
+
+    def run(self) -> None:
+        try:
+            self.app = QApplication(sys.argv)
+            # Dialogs come and go, the loop must keep running without any window
+            self.app.setQuitOnLastWindowClosed(False)
+        except BaseException as exc:
+            self._error = exc
+            return
+        finally:
+            self._ready.set()
+
+        self.app.exec_()
+        with self.lock:
+            self.accepting = False
+        self._on_exit()
+
+        # Qt objects must be destroyed in the thread they belong to, not at interpreter exit
+        for widget in QApplication.topLevelWidgets():
+            widget.deleteLater()
+        QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+        self.app = None
+
+
+class MessageBoxHandler(QObject):
+    """
+    Thread-safe message box handler
+    """
+    # The registered dialog types by kind, see `register_dialog`
+    _dialogs: Dict[str, _DialogType] = {}
+
+    # Carry a call to the main thread, either returning at once or waiting until it ran
+    _queued_call = pyqtSignal(object)
+    _blocking_call = pyqtSignal(object)
+
+    # Icon and button roles of every QMessageBox based dialog kind
+    _BOX_KINDS = {
+        "info": (QMessageBox.Icon.Information, (QMessageBox.ButtonRole.AcceptRole,)),
+        "warning": (QMessageBox.Icon.Warning, (QMessageBox.ButtonRole.AcceptRole,)),
+        "error": (QMessageBox.Icon.Critical, (QMessageBox.ButtonRole.AcceptRole,)),
+        "yes_no": (QMessageBox.Icon.Question, (QMessageBox.ButtonRole.YesRole, QMessageBox.ButtonRole.NoRole)),
+        "yes_no_continue": (QMessageBox.Icon.Question, (QMessageBox.ButtonRole.YesRole,
+                                                        QMessageBox.ButtonRole.NoRole,
+                                                        QMessageBox.ButtonRole.AcceptRole)),
+    }
+
+    def __init__(self,
+                 style: Optional[str] = "Fusion", 
+                 bg_color: Optional[str] = "White",
+                 parent: Optional[QWidget] = None,
+                 coalesce_window: Optional[float] = None,
+                 rate_limit: float = 1.0,
+                 rate_burst: int = 5,
+                 max_backlog: int = 100,
+                 max_visible: Optional[int] = None,
+                 queue_capacity: int = 100,
+                 overflow: str = "block",
+                 pool_size: int = 0,
+                 image_cache_bytes: int = 32 * 1024 * 1024,
+                 backend: Optional[HeadlessBackend] = None,
+                 metrics: Optional[DialogMetrics] = None,
+                 timeout: Optional[float] = None,
+                 gui_thread: bool = False,
+                 answer_cache: Union[str, AnswerCache, None] = None,
+                 progress_fps: float = 30,
+                 toasts: bool = False,
+                 toast_limit: int = 4,
+                 toast_duration: Optional[float] = 5.0,
+                 toast_history: int = 1000,
+                 modeless: bool = False,
+                 details_threshold: int = 4000,
+                 summary_lines: int = 12) -> None:
+        """
+        :param style: The style to use for the message boxes. Default is "Fusion".
+                      Based on the available styles in QStyleFactory.
+        :param bg_color: The background color of the message boxes. Default is "White".
+        :param parent: The parent widget for the message boxes <Optional>.
+        :param coalesce_window: Enables storm protection for info/warning/error messages <Optional>.
+                                Identical messages arriving within this many seconds are merged into
+                                one dialog showing an occurrence count. Default is None (disabled).
+        :param rate_limit: With storm protection, the dialogs per second allowed for each message category. Default is 1.0.
+        :param rate_burst: With storm protection, the dialogs per category that may appear back to back. Default is 5.
+        :param max_backlog: With storm protection, the maximum number of rate limited dialogs waiting
+                            to be shown. Further messages are dropped. Default is 100.
+        :param max_visible: Enables the priority scheduler for calls from other threads <Optional>.
+                            Errors are shown before warnings, questions and info messages,
+                            and at most this many dialogs are visible at once. Default is None (disabled).
+        :param queue_capacity: With the scheduler, the maximum number of dialogs waiting to be shown. Default is 100.
+        :param overflow: With the scheduler, what happens when the queue is full: "block" waits for room,
+                         "drop" discards the dialog (the call returns None) and "reject" raises `DialogQueueFull`.
+                         Default is "block".
+        :param pool_size: Number of pre-built message boxes kept per dialog kind for reuse.
+                          The pool is filled once the event loop is idle, see `warm_pool`. Default is 0 (disabled).
+        :param image_cache_bytes: Memory budget of the decoded instruction images cache in bytes.
+                                  Default is 32 MiB, 0 disables the cache.
+        :param backend: A `HeadlessBackend` answering every dialog instead of showing it <Optional>.
+                        No QApplication or widget is created then. Default is None (show real dialogs).
+        :param metrics: A `DialogMetrics` registry recording the timing of every dialog <Optional>.
+                        Calls from other threads are then dispatched as futures to carry their timing.
+        :param timeout: Seconds a dialog stays open before it closes itself with its default answer <Optional>.
+                        Applies to every call that doesn't pass its own `timeout`. Default is None (wait forever).
+        :param gui_thread: Start a dedicated thread that creates the QApplication and runs its event loop,
+                           for programs where only worker threads show dialogs. The handler owns the thread,
+                           stop it with `shutdown`. Needs that no QApplication exists yet and no `parent`.
+                           Not supported on macOS, where Qt only runs in the main thread. Default is False.
+        :param answer_cache: Offer to remember the answers of Yes/No, Yes/No/Continue and combo box questions <Optional>.
+                             "handler" gives the handler its own `AnswerCache`, "session" shares `AnswerCache.session()`
+                             with every handler of the process, or pass a cache. Default is None (disabled).
+        :param progress_fps: How often per second the progress bars are redrawn at most. Default is 30.
+        :param toasts: Show info/warning/error messages as non-modal notifications, see `notify`. The calls
+                       return right away, even with `block`. Default is False (modal message boxes).
+        :param toast_limit: The number of notifications shown at once, more collapse into "+N more". Default is 4.
+        :param toast_duration: Seconds a notification is shown, None until it is closed. Default is 5.
+        :param toast_history: The number of notifications kept for `notification_history`. Default is 1000.
+        :param modeless: Show the dialogs of calls from other threads and of futures non-modally, without a nested
+                         event loop: the main thread returns to its own loop right away and the `finished` signal
+                         of the dialog completes the call. Only blocking calls from the main thread itself still
+                         wait in a loop of their own. Default is False.
+        :param details_threshold: Info/warning/error contents longer than this many characters show a summary,
+                                  with the full text in a details view read only when the user expands it.
+                                  Default is 4000.
+        :param summary_lines: The number of first lines in the summary of a long content, besides the last line.
+                              Default is 12.
+        """
+        if gui_thread and backend is None:
+            if QApplication.instance() is not None:
+                raise RuntimeError("gui_thread=True needs to create the QApplication, but one exists already")
+            if parent is not None:
+                raise ValueError("gui_thread=True can't be combined with a parent widget")
+
+        self._backend = backend
+
+        # Qt is set up on the first dialog, see `warmup`. If no QApplication exists, one is created then
+        # in the thread that built the handler. A headless backend doesn't need any, and a GUI thread creates its own.
+        self._app = None
+        self._app_ident = threading.get_ident()
+        self._gui_ready = backend is not None
+
+        # If a parent was provided, pass it along; otherwise, use None.
+        super().__init__(parent)
+
+        self._queued_call.connect(self._run_call, Qt.ConnectionType.QueuedConnection)
+        self._blocking_call.connect(self._run_call, Qt.ConnectionType.BlockingQueuedConnection)
+
+        self._closed = False
+        self.modeless = modeless
+        self.details_threshold = details_threshold
+        self.summary_lines = summary_lines
+        # Completion of the call a modeless dialog slot is about to run for, see `_start_future`
+        self._on_done = None
+        # The dialogs of the handler being shown, those shown without waiting are kept alive until closed
+        self._open_dialogs = set()
+        self._gui_thread = None
+        # The identifier of the main (GUI) thread, once known
+        self._gui_ident = None
+        if gui_thread and backend is None:
+            self._gui_thread = _GuiThread(self._finish_gui_thread)
+            # The thread owns the QApplication, it is destroyed there when the thread ends
+            app = self._gui_thread.start_and_wait()
+            self._gui_ident = self._gui_thread.ident
+            # The slots of the handler run in the thread it lives in
+            self.moveToThread(app.thread())
+
+        self._style_name = style
+        self._style, self._palette = None, None
+        self.bg_color = bg_color
+
+        self._coalescer = None
+        if coalesce_window is not None:
+            self._coalescer = _MessageCoalescer(coalesce_window, rate_limit, rate_burst, max_backlog)
+        self._drain_scheduled = False
+
+        self._scheduler = None
+        if max_visible is not None:
+            self._scheduler = _DialogScheduler(max_visible, queue_capacity, overflow)
+
+        self._ledger = _DialogLedger()
+        self._pool = None
+        if pool_size > 0 and backend is None:
+            self._pool = _DialogPool(pool_size, self._new_message_box)
+            self._post(self.warm_pool.__name__)
+
+        self._image_cache = _ImageCache(image_cache_bytes) if image_cache_bytes > 0 else None
+
+        # Images are decoded no larger than the screen, which is only safe to query here or in `_ensure_gui`.
+        # Already now if a QApplication exists, for the images loaded in other threads before the first dialog
+        self._max_image_size = QSize()
+        if backend is None and QApplication.instance() is not None: self._read_screen_size()
+
+        self._metrics = metrics
+        self.timeout = timeout
+        # Contexts of the dialogs currently running in the main thread, innermost last
+        self._contexts: List[_DialogContext] = []
+        self._handover: Optional[_DialogContext] = None
+        # Whether the last dialog with a timeout answered in a thread timed out
+        self._answers = threading.local()
+
+        if answer_cache == "handler":
+            answer_cache = AnswerCache()
+        elif answer_cache == "session":
+            answer_cache = AnswerCache.session()
+        self.answer_cache = answer_cache
+
+        # Calls from other threads that need a future: to go through the priority scheduler,
+        # to carry their timing, to be cancelled on shutdown or to be completed by a modeless dialog
+        self._future_dispatch = (self._scheduler is not None or self._metrics is not None
+                                 or self._gui_thread is not None or modeless)
+
+        self._progress_interval = max(1, round(1000 / progress_fps))
+        self._progress_window = None
+
+        self.toasts = toasts
+        self.toast_duration = toast_duration
+        self._toast_limit = toast_limit
+        self._notifications = deque(maxlen=toast_history)
+        # Notifications waiting for the main thread, which takes them all at once
+        self._pending_toasts = deque(maxlen=toast_history)
+        self._toasts_posted = False
+        # Numbers the queued notifications, to count those pushed out of the full queue
+        self._toast_numbers = itertools.count()
+        self._last_toast = -1
+        self._toast_stack = None
+        self._history_viewer = None
+
+    @property
+    def style(self) -> Optional[QStyle]:
+        """
+        The style of the dialogs, None for the style of the application. Created on first use.
+        """
+        self._ensure_gui()
+        return self._style
+
+    def warmup(self) -> Optional[QApplication]:
+        """
+        Set up Qt now instead of on the first dialog: create the QApplication if none exists,
+        the style, the palette and the message boxes of the pool. For programs that would rather pay
+        this at start-up than when they show their first dialog. Call it in the thread that built the handler.
+
+        :return: The QApplication, e.g. to run its event loop. None for a headless handler,
+                 or once `shutdown` ended the handler's GUI thread.
+        """
+        if self._backend is not None or self._closed: return None
+
+        self._ensure_gui()
+        if self._pool is not None and self._gui_ready: self._run_in_gui_thread(self.warm_pool)
+        return QApplication.instance()
+
+    def _ensure_gui(self) -> None:
+        """
+        Set up what the dialogs need, once: the QApplication if none exists, the shared style and palette
+        and the screen size. Only the thread that built the handler creates a missing QApplication,
+        calls from other threads are queued to it. The rest is set up in the GUI thread.
+        """
+        # Nothing runs any more in a GUI thread that was shut down
+        if self._gui_ready or self._closed: return
+
+        if self._gui_thread is None:
+            if QApplication.instance() is None:
+                if threading.get_ident() != self._app_ident: return
+                self._app = QApplication(sys.argv)
+            # The style belongs to the GUI thread, the first dialog slot sets it up there
+            elif not self._in_main_thread():
+                return
+
+        style = self._run_in_gui_thread(partial(_get_cached_style, self._style_name, self.bg_color))
+        # The GUI thread was shut down meanwhile
+        if style is None: return
+        self._style, self._palette = style
+        self._read_screen_size()
+        self._gui_ready = True
+
+    def _read_screen_size(self) -> None:
+        screen = self._run_in_gui_thread(QApplication.primaryScreen)
+        if screen is not None: self._max_image_size = screen.availableGeometry().size()
+
+    @classmethod
+    def register_dialog(cls, spec:DialogSpec) -> DialogSpec:
+        """
+        Add a dialog type. The handler generates the public method `spec.name` and its asyncio variant,
+        with blocking, futures, timeouts, the scheduler, metrics and the headless backend like the built-in dialogs.
+
+        `spec.show(handler, title, content, ...)` runs in the main thread. It builds the dialog,
+        runs it with `handler.exec_dialog` and returns its raw result, which `spec.convert` may map to the answer
+        (`handler.open_dialog` also supports `modeless` handlers):
+
+            def show_rating(handler, title, content, stars):
+                dialog = QDialog(handler.dialog_parent())
+                ...
+                handler.exec_dialog(dialog)
+                return slider.value()
+
+            MessageBoxHandler.register_dialog(DialogSpec(
+                "rating_message", "rating", show_rating,
+                params=(("title", "Rating"), ("content", "How was it?"), ("stars", 5))))
+            handler.rating_message(content="How was the trip?")
+
+        :param spec: The declaration of the dialog.
+
+        :return: The spec.
+        """
+        spec = spec._replace(show=_dialog_slot(spec.kind)(spec.show))
+        cls._add_dialog(spec)
+        return spec
+
+    @classmethod
+    def _add_dialog(cls, spec:DialogSpec) -> None:
+        """
+        Register a dialog type whose `show` is already a dialog slot, see `register_dialog`.
+        """
+        if spec.kind in cls._dialogs or hasattr(cls, spec.name) or hasattr(cls, "a" + spec.name):
+            raise ValueError(f"A dialog {spec.kind!r} or the method {spec.name!r} exists already")
+        if tuple(name for name, _ in spec.params[:2]) != ("title", "content"):
+            raise ValueError("The parameters of a dialog must start with title and content")
+
+        # A subclass registers its dialogs without adding them to its base class
+        if "_dialogs" not in cls.__dict__: cls._dialogs = dict(cls._dialogs)
+
+        dialog = _DialogType(spec)
+        method, async_method = dialog.methods()
+        setattr(cls, spec.name, method)
+        setattr(cls, "a" + spec.name, async_method)
+        cls._dialogs[spec.kind] = dialog
+
+    def exec_dialog(self, dialog:QDialog) -> int:
+        """
+        Style and run a dialog built by the `show` of a registered dialog type, in the main thread.
+        Its countdown, timing and checkbox are set up like for the built-in dialogs.
+        The dialog is deleted once control returns to the event loop, `show` can still read its widgets.
+
+        :param dialog: The dialog to run.
+
+        :return: The result code of `QDialog.exec_`.
+        """
+        self._set_style(dialog)
+        self._dialog_ready(dialog)
+        self._open_dialogs.add(dialog)
+        try:
+            return dialog.exec_()
+        finally:
+            self._open_dialogs.discard(dialog)
+            dialog.deleteLater()
+
+    def dialog_parent(self) -> Optional[QWidget]:
+        """
+        Get the parent window for a new dialog: the active window, unless it is a dialog of this handler,
+        which may close and be deleted before its child, or a closed window still active until its deletion.
+        """
+        window = get_active_window()
+        if window is None or window in self._open_dialogs or not window.isVisible(): return None
+        return window
+
+    def open_dialog(self, dialog:QDialog, finish:Callable[[], Any]) -> Any:
+        """
+        Style and show a dialog built by the `show` of a registered dialog type, like `exec_dialog`,
+        and get the answer from `finish` once the dialog is closed. Unlike `exec_dialog`, this doesn't
+        run a nested event loop for calls with a timeout or of a `modeless` handler: `show` must return
+        what this returns, and the handler completes the call when the dialog closes.
+        The dialog is deleted after `finish`.
+
+        :param dialog: The dialog to show. Its buttons must close it, e.g. with `accept`.
+        :param finish: Called once the dialog is closed, returns the answer.
+
+        :return: The result of `finish`, or a marker for the handler if the dialog is still open.
+        """
+        self._set_style(dialog)
+        self._dialog_ready(dialog)
+        return self._await_dialog(dialog, finish)
+
+    # The public dialog methods are generated from their `DialogSpec`, see `register_dialog` and `_BUILTIN_DIALOGS`
+
+    def apply_to_all(self, label:str = "Apply to all remaining") -> ApplyToAll:
+        """
+        Start asking the questions of a per-item loop with an "Apply to all remaining" checkbox.
+        Once the user ticks it, the rest of the loop is answered without showing or dispatching any dialog.
+
+            ask = handler.apply_to_all()
+            for path in paths:
+                if ask.yes_no_message("Delete", f"Delete {path}?"): os.remove(path)
+
+        :param label: The text of the checkbox.
+
+        :return: The object asking the questions, with `yes_no_message` and `yes_no_continue_message`.
+        """
+        return ApplyToAll(self, label)
+
+    def progress_message(self,
+                         title="Progress",
+                         content="",
+                         maximum:Optional[float] = 100,
+                         cancellable:bool = True,
+                         button_cancel="Cancel") -> ProgressHandle:
+        """
+        Show a progress bar in the progress window of the handler, with its throughput and estimated time left.
+        Returns right away, from any thread. The bars of all concurrent jobs share one non-modal window.
+
+        :param title: The title of the progress bar.
+        :param content: The text shown above the bar, until an update sets another one.
+        :param maximum: The value of a finished job. None or 0 shows a busy indicator. Default is 100.
+        :param cancellable: Whether the bar has a cancel button. Default is True.
+        :param button_cancel: The text of the cancel button.
+
+        :return: The handle to update the progress with, from any thread and at any rate.
+                 Close it when the job is done, or use it as a context manager.
+        """
+        handle = ProgressHandle(title, content, maximum, cancellable, button_cancel)
+
+        if self._backend is not None:
+            self._backend.respond("progress", title, content, maximum=maximum)
+            return handle
+
+        self._ensure_gui()
+        if not self._post(self._add_progress.__name__, handle):
+            # The GUI thread has ended
+            handle.close()
+
+        return handle
+
+    def notify(self,
+               title="Information",
+               content="",
+               kind:str = "info",
+               duration:Optional[float] = None) -> None:
+        """
+        Show a non-modal notification in the toast stack of the handler and return right away, from any thread.
+        Notifications don't block anything and don't run an event loop. Bursts are shown at once:
+        the newest `toast_limit` notifications stay on the stack and the others collapse into "+N more".
+
+        :param title: The title of the notification.
+        :param content: The text of the notification.
+        :param kind: "info", "warning" or "error". Default is "info".
+        :param duration: Seconds the notification is shown, by default the handler's `toast_duration`.
+                         0 keeps it until it is closed.
+        """
+        if kind not in _NOTIFICATION_ICONS: raise ValueError(f"Unknown notification kind {kind!r}")
+
+        self._notifications.append(Notification(kind, title, content, threading.current_thread().name, time.time()))
+        if self._backend is not None:
+            self._backend.respond(kind, title, content)
+            return
+
+        self._ensure_gui()
+        if duration is None: duration = self.toast_duration
+        self._pending_toasts.append((next(self._toast_numbers), kind, title, content, duration))
+        if not self._toasts_posted:
+            self._toasts_posted = True
+            self._post(self._show_toasts.__name__)
+
+    def notification_history(self) -> List[Notification]:
+        """
+        :return: The latest notifications, oldest first, including those that never made it onto the stack.
+        """
+        return list(self._notifications)
+
+    def show_notification_history(self) -> None:
+        """
+        Open the notification history in a non-modal window, from any thread.
+        """
+        if self._backend is not None: return
+
+        self._ensure_gui()
+        self._post(self._show_history.__name__)
+
+    def prefetch_images(self, image_paths:List[str]) -> None:
+        """
+        Decode images into the image cache ahead of `instruction_message_with_image`.
+        The decoding runs in the calling thread, call it from a worker thread to keep the GUI responsive.
+
+        :param image_paths: The paths of the image files to load.
+        """
+        self._ensure_gui()
+        for image_path in image_paths:
+            self._load_image(image_path)
+
+    def shutdown(self, timeout:Optional[float] = None) -> None:
+        """
+        Stop the GUI thread started with `gui_thread=True` and wait for it.
+        Dialogs still open are closed as if dismissed, and queued dialog calls are cancelled (they return None).
+        Later calls are cancelled too. Does nothing for a handler without its own GUI thread.
+
+        :param timeout: Seconds to wait for the GUI thread to end <Optional>.
+        """
+        if self._gui_thread is None or self._closed: return
+
+        self._closed = True
+        self._post(self._close_gui.__name__)
+        # The GUI thread itself can't wait for its own end
+        if not self._in_main_thread(): self._gui_thread.join(timeout)
+
+    def __enter__(self) -> "MessageBoxHandler":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    @pyqtSlot()
+    def _show_toasts(self) -> None:
+        """
+        Internal slot that shows the notifications queued since it last ran.
+        """
+        # Reset before taking them, a notification queued meanwhile posts this slot again
+        self._toasts_posted = False
+        pending = []
+        while self._pending_toasts:
+            pending.append(self._pending_toasts.popleft())
+        if not pending: return
+        dropped = pending[0][0] - self._last_toast - 1
+        self._last_toast = pending[-1][0]
+
+        if self._toast_stack is None:
+            self._toast_stack = _ToastStack(self._toast_limit, self._notification_icons(),
+                                            self._show_history)
+            self._set_style(self._toast_stack)
+
+        self._toast_stack.add([toast[1:] for toast in pending], dropped)
+
+    @pyqtSlot()
+    def _show_history(self) -> None:
+        """
+        Internal slot that opens the notification history.
+        """
+        if self._history_viewer is None:
+            self._history_viewer = _NotificationHistory(self._notification_icons())
+            self._set_style(self._history_viewer)
+
+        self._history_viewer.show_history(list(self._notifications))
+
+    def _notification_icons(self) -> Dict[str, QPixmap]:
+        style = self.style or QApplication.style()
+        return {kind: style.standardIcon(pixmap).pixmap(24, 24) for kind, pixmap in _NOTIFICATION_ICONS.items()}
+
+    @pyqtSlot(object)
+    def _add_progress(self, handle:ProgressHandle) -> None:
+        """
+        Internal slot that adds a progress bar to the progress window, creating the window on first use.
+        """
+        if self._progress_window is None:
+            self._progress_window = _ProgressWindow(self._progress_interval)
+            self._set_style(self._progress_window)
+
+        self._progress_window.add(handle)
+
+    @pyqtSlot()
+    def warm_pool(self) -> None:
+        """
+        Build the pooled message boxes now instead of on first use. Must be called from the main thread.
+        Does nothing if the handler was created without a `pool_size`.
+        """
+        if self._pool is not None: self._pool.warm(self._BOX_KINDS)
+
+    def pool_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get the usage of the dialog pool.
+
+        :return: Per dialog kind, the number of reused dialogs ("hits"), newly built ones ("misses")
+                 and dialogs waiting for reuse ("idle"). Empty if the pool is disabled.
+        """
+        return self._pool.stats() if self._pool is not None else {}
+
+    def dialog_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get the number of dialogs of the handler that Qt still holds, to watch a long-running program for leaks.
+        Every dialog is deleted once it is answered, unless it goes back to the pool.
+
+        :return: Per dialog kind, the number of dialogs built ("created"), deleted since ("destroyed")
+                 and the difference ("alive"), which includes the open dialogs and the idle ones of the pool.
+        """
+        return self._ledger.stats()
+
+    @_dialog_slot("instruction")
+    def _instruction_message_with_image(self, title, content, button_ok, image_path, image) -> None:
+        """
+        Internal slot that actually shows the QMessageBox in the main thread.
+        """
+        # Create a custom dialog
+        dialog = QDialog(self.dialog_parent(), Qt.WindowType.WindowStaysOnTopHint)
+        dialog.setWindowTitle(title)
+
+        # Set up layout
+        layout = QVBoxLayout(dialog)
+
+        # Add content label
+        label = QLabel(content)
+        layout.addWidget(label)
+
+        # Add image if provided
+        if image_path:
+            pixmap = QPixmap.fromImage(image) if image is not None else QPixmap()
+            if not pixmap.isNull():
+                image_label = QLabel()
+                image_label.setPixmap(pixmap)
+                layout.addWidget(image_label)
+            else:
+                error_label = QLabel("Failed to load image.")
+                layout.addWidget(error_label)
+
+        # Add Close button
+        close_button = QPushButton(button_ok)
+        close_button.clicked.connect(dialog.accept)
+        layout.addWidget(close_button)
+
+        self._set_style(dialog)
+        self._dialog_ready(dialog)
+
+        return self._await_dialog(dialog, lambda: None)
+
+    @_dialog_slot("combo_box")
+    def _combo_box_message(self, title, content, button_ok, options) -> int:
+        """
+        Internal slot that actually shows the QMessageBox in the main thread.
+        Returns the selected option.
+        """
+        if options is None:
+            options = []
+
+        # Create a custom dialog
+        dialog = QDialog(self.dialog_parent(), Qt.WindowType.WindowStaysOnTopHint)
+        dialog.setWindowTitle(title)
+
+        # Set up layout
+        layout = QVBoxLayout(dialog)
+
+        # Add content label
+        label = QLabel(content)
+        layout.addWidget(label)
+
+        # Add combo box
+        combo_box = QComboBox()
+        combo_box.addItems(options)
+        layout.addWidget(combo_box)
+
+        # Add OK button
+        ok_button = QPushButton(button_ok)
+        ok_button.clicked.connect(dialog.accept)
+        layout.addWidget(ok_button)
+
+        self._set_style(dialog)
+        self._dialog_ready(dialog)
+
+        # Once the dialog is closed, get the selected item
+        return self._await_dialog(dialog, combo_box.currentIndex)
+
+    @_dialog_slot("filtered_combo_box")
+    def _filtered_combo_box_message(self, title, content, button_ok, options, index) -> int:
+        """
+        Internal slot that actually shows the filterable combo box dialog in the main thread.
+        Returns the index of the selected option, or -1 if nothing was selected.
+        """
+        # Create a custom dialog
+        dialog = QDialog(self.dialog_parent(), Qt.WindowType.WindowStaysOnTopHint)
+        dialog.setWindowTitle(title)
+
+        # Set up layout
+        layout = QVBoxLayout(dialog)
+
+        # Add content label
+        label = QLabel(content)
+        layout.addWidget(label)
+
+        # Add combo box, reading the rows from the shared options on demand
+        model = _LazyListModel(options, dialog)
+        combo_box = QComboBox()
+        combo_box.setModel(model)
+        # Don't measure every row to size the combo box and its list
+        combo_box.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToMinimumContentsLengthWithIcon)
+        combo_box.setMinimumContentsLength(30)
+        combo_box.view().setUniformItemSizes(True)
+
+        # Add filter box
+        if index is not None:
+            filter_edit = QLineEdit()
+            filter_edit.setPlaceholderText("Type to filter...")
+            filter_edit.setClearButtonEnabled(True)
+            layout.addWidget(filter_edit)
+
+            # Filter once typing pauses rather than on every key
+            filter_timer = QTimer(dialog)
+            filter_timer.setSingleShot(True)
+            filter_timer.setInterval(150)
+            filter_edit.textChanged.connect(filter_timer.start)
+
+            def on_filter():
+                text = filter_edit.text()
+                model.set_rows(index.match(text) if text else None)
+                combo_box.setCurrentIndex(0 if model.rowCount() else -1)
+
+            filter_timer.timeout.connect(on_filter)
+
+        layout.addWidget(combo_box)
+
+        # Add OK button
+        ok_button = QPushButton(button_ok)
+        ok_button.clicked.connect(dialog.accept)
+        layout.addWidget(ok_button)
+
+        self._set_style(dialog)
+        self._dialog_ready(dialog)
+
+        # Once the dialog is closed, get the selected option
+        def selected():
+            row = combo_box.currentIndex()
+            return model.option_index(row) if row >= 0 else -1
+
+        return self._await_dialog(dialog, selected)
+
+    @_dialog_slot("yes_no")
+    def _yes_no_message(self, title, content, yes_text, no_text) -> bool:
+        """
+        Internal slot that actually shows the QMessageBox in the main thread.
+        Returns True if user clicked Yes, else False.
+        """
+        msg_box = self._acquire_message_box("yes_no", title, content, (yes_text, no_text))
+        yes_btn = msg_box.pool_buttons[0]
+
+        def answer():
+            clicked = msg_box.clickedButton()
+            self._release_message_box("yes_no", msg_box)
+            return clicked == yes_btn
+
+        return self._await_dialog(msg_box, answer, modal=True, dispose=False)
+    
+    @_dialog_slot("info")
+    def _info_message(self, title, content, ok_text, details) -> None:
+        """
+        Internal slot that actually shows the QMessageBox in the main thread.
+        Returns None after closure or Ok button clicked.
+        """
+        if details is not None:
+            return self._await_dialog(self._new_details_dialog("info", title, content, ok_text, details),
+                                      lambda: None, modal=True)
+
+        msg_box = self._acquire_message_box("info", title, content, (ok_text,))
+        return self._await_dialog(msg_box, partial(self._release_message_box, "info", msg_box), modal=True,
+                                  dispose=False)
+
+    @_dialog_slot("warning")
+    def _warning_message(self, title, content, ok_text, details) -> None:
+        """
+        Internal slot that actually shows the QMessageBox in the main thread.
+        Returns None after closure or Ok button clicked.
+        """
+        if details is not None:
+            return self._await_dialog(self._new_details_dialog("warning", title, content, ok_text, details),
+                                      lambda: None, modal=True)
+
+        msg_box = self._acquire_message_box("warning", title, content, (ok_text,))
+        return self._await_dialog(msg_box, partial(self._release_message_box, "warning", msg_box), modal=True,
+                                  dispose=False)
+
+    @_dialog_slot("error")
+    def _error_message(self, title, content, ok_text, details) -> None:
+        """
+        Internal slot that actually shows the QMessageBox in the main thread.
+        Returns None after closure or Ok button clicked.
+        """
+        if details is not None:
+            return self._await_dialog(self._new_details_dialog("error", title, content, ok_text, details),
+                                      lambda: None, modal=True)
+
+        msg_box = self._acquire_message_box("error", title, content, (ok_text,))
+        return self._await_dialog(msg_box, partial(self._release_message_box, "error", msg_box), modal=True,
+                                  dispose=False)
+
+    def _load_image(self, image_path:str) -> Optional[QImage]:
+        """
+        Decode an image in the calling thread, downscaled to fit the screen, using the image cache.
+
+        :return: The decoded image, or None if there is no path or the image can't be loaded.
+        """
+        if not image_path: return None
+
+        try:
+            path = os.path.abspath(image_path)
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if self._image_cache is not None:
+            image = self._image_cache.get(path, stamp)
+            if image is not None: return image
+
+        reader = QImageReader(path)
+        reader.setAutoTransform(True)
+
+        size = reader.size()
+        max_size = self._max_image_size
+        if size.isValid() and max_size.isValid() and \
+                (size.width() > max_size.width() or size.height() > max_size.height()):
+            # Let the decoder scale down, much cheaper than decoding the full image first
+            reader.setScaledSize(size.scaled(max_size, Qt.AspectRatioMode.KeepAspectRatio))
+
+        image = reader.read()
+        if image.isNull(): return None
+
+        if self._image_cache is not None: self._image_cache.put(path, stamp, image)
+        return image
+
+    def _new_message_box(self, kind:str) -> QMessageBox:
+        """
+        Build a styled message box of the given kind with empty buttons.
+        The buttons are kept in creation order in `pool_buttons`.
+        """
+        icon, roles = self._BOX_KINDS[kind]
+
+        msg_box = QMessageBox()
+        msg_box.setWindowFlags(msg_box.windowFlags() | Qt.WindowType.WindowStaysOnTopHint)
+        msg_box.setIcon(icon)
+        msg_box.pool_buttons = [msg_box.addButton("", role) for role in roles]
+        self._set_style(msg_box)
+        self._ledger.track(kind, msg_box)
+        return msg_box
+
+    def _new_details_dialog(self, kind:str, title:str, content:str, ok_text:str,
+                            details:_DetailText) -> _DetailsDialog:
+        """
+        Build a message dialog of the given kind with a summary and its details, see `_DetailsDialog`.
+        """
+        icon = QMessageBox.standardIcon(self._BOX_KINDS[kind][0])
+        dialog = _DetailsDialog(self.dialog_parent(), icon, title, content, ok_text, details)
+        self._set_style(dialog)
+        self._dialog_ready(dialog)
+        return dialog
+
+    def _acquire_message_box(self, kind:str, title:str, content:str, button_texts:tuple) -> QMessageBox:
+        """
+        Get a message box of the given kind from the pool (or build one) and fill in its texts.
+        """
+        msg_box = self._pool.acquire(kind) if self._pool is not None else self._new_message_box(kind)
+
+        # Keep the window flags, setParent resets them otherwise
+        msg_box.setParent(self.dialog_parent(), msg_box.windowFlags())
+        msg_box.setWindowTitle(title)
+        msg_box.setText(content)
+        msg_box.setInformativeText("")
+        for button, text in zip(msg_box.pool_buttons, button_texts):
+            button.setText(text)
+
+        self._dialog_ready(msg_box)
+        return msg_box
+
+    def _dialog_ready(self, dialog:QDialog) -> None:
+        """
+        Called by the dialog slots once their dialog is built: records it in the timing of
+        the innermost running dialog, watches for its first paint and starts its countdown.
+        """
+        context = self._contexts[-1] if self._contexts else None
+        self._ledger.track(context.kind if context is not None else "custom", dialog)
+        if context is None: return
+
+        if context.timing is not None:
+            context.timing.built = time.perf_counter()
+            context.paint_filter = _FirstPaintFilter(context.timing, dialog)
+            dialog.installEventFilter(context.paint_filter)
+
+        if context.timeout is not None:
+            context.countdown = _Countdown(context, dialog)
+
+        if context.check_label is not None:
+            context.check_box = QCheckBox(context.check_label)
+            context.check_box.toggled.connect(context.set_checked)
+            if isinstance(dialog, QMessageBox):
+                dialog.setCheckBox(context.check_box)
+            else:
+                # Right above the button of the dialog
+                layout = dialog.layout()
+                layout.insertWidget(layout.count() - 1, context.check_box)
+
+    def _hand_over(self, context:_DialogContext, call:Callable) -> Any:
+        """
+        Run a dialog slot in the main thread with the context prepared by its calling thread.
+        """
+        self._handover = context
+        try:
+            return call()
+        finally:
+            self._handover = None
+
+    def _await_dialog(self, dialog:QDialog, finish:Callable[[], Any], modal:bool = False, dispose:bool = True) -> Any:
+        """
+        Called by the dialog slots to show their dialog once it is ready. `finish` reads the answer
+        and cleans up once the dialog is closed.
+        A call with a completion callback (see `modeless`, and calls with a timeout) doesn't wait:
+        the dialog is shown without a loop of its own, the slot returns `_PENDING` and the `finished` signal
+        of the dialog completes the call. Only a `modeless` handler shows it non-modally.
+        Any other call waits in a loop of its own and returns the result of `finish`.
+
+        :param modal: Whether a waiting call shows the dialog modally.
+        :param dispose: Whether to delete the dialog after `finish`, False for the pooled ones `finish` releases.
+        """
+        context = self._contexts[-1] if self._contexts else None
+        if context is None or context.on_done is None:
+            self._open_dialogs.add(dialog)
+            try:
+                if modal:
+                    dialog.exec_()
+                else:
+                    loop = QEventLoop()
+                    dialog.finished.connect(loop.quit)
+                    dialog.show()
+                    loop.exec_()
+                    dialog.finished.disconnect(loop.quit)
+            except BaseException:
+                finish()
+                raise
+            finally:
+                self._open_dialogs.discard(dialog)
+                # Parented dialogs would live as long as their parent window otherwise.
+                # Deleted once back in the event loop, `finish` can still read the widgets
+                if dispose: dialog.deleteLater()
+            return finish()
+
+        def on_finished():
+            # Pooled dialogs are reused for other calls
+            dialog.finished.disconnect(on_finished)
+            try:
+                res, exc = self._finish_context(context, finish()), None
+            except BaseException as error:
+                res, exc = self._finish_context(context, None), error
+            if dispose: dialog.deleteLater()
+            context.on_done(res, exc)
+            # Drop it once `finished` returned, deleting a dialog from its own signal would crash
+            QTimer.singleShot(0, partial(self._open_dialogs.discard, dialog))
+
+        self._open_dialogs.add(dialog)
+        dialog.finished.connect(on_finished)
+        if modal and not self.modeless: dialog.setWindowModality(Qt.WindowModality.ApplicationModal)
+        dialog.show()
+        dialog.raise_()
+        return _PENDING
+
+    def _finish_context(self, context:_DialogContext, res:Any) -> Any:
+        """
+        Release the context of a closed dialog and record its timing.
+
+        :return: The result of the dialog slot, or `_TIMED_OUT` if its timeout closed it.
+        """
+        context.release()
+        timing = context.timing
+        if timing is not None:
+            timing.closed = time.perf_counter()
+            self._metrics.record(timing)
+
+        return _TIMED_OUT if context.timed_out else res
+
+    def _release_message_box(self, kind:str, msg_box:QMessageBox) -> None:
+        """
+        Return a closed message box to the pool, or delete it if there is no room in the pool.
+        """
+        if self._pool is not None and self._pool.release(kind, msg_box):
+            # Detach it so it survives its parent window
+            msg_box.setParent(None, msg_box.windowFlags())
+        else:
+            msg_box.deleteLater()
+
+    def _post_notice(self, kind:str, title:str, content:str, ok_text:str,
+                     block:bool, as_future:bool, timeout:Optional[float],
+                     details:Optional[_DetailText] = None) -> Optional[Future]:
+        """
+        Route an info/warning/error message through the storm protection layer.
+        Blocked callers are released together when the merged dialog is closed.
+        """
+        entry, action = self._coalescer.post(kind, title, content, ok_text, details)
+        in_main_thread = self._in_main_thread()
+
+        if action == _MessageCoalescer.SHOW:
+            if in_main_thread and block and not as_future:
+                self._hand_over(_DialogContext(timeout), partial(self._show_coalesced, entry))
+            else:
+                self._submit_coalesced(entry, timeout)
+        elif action == _MessageCoalescer.MERGED:
+            if self._coalescer.request_refresh(entry):
+                self._post(self._refresh_coalesced.__name__, entry)
+        elif action == _MessageCoalescer.QUEUED:
+            self._post(self._schedule_drain.__name__)
+
+        if as_future:
+            future = Future()
+
+            def on_closed(_):
+                if future.set_running_or_notify_cancel(): future.set_result(None)
+
+            entry.closed.add_done_callback(on_closed)
+            return future
+
+        # The main thread cannot wait for a dialog it still has to show
+        if block and not in_main_thread: entry.closed.result()
+
+    def _submit_coalesced(self, entry:_CoalescedMessage, timeout:Optional[float]) -> None:
+        """
+        Queue a merged dialog for the main thread and close it right away if the scheduler refuses it.
+        """
+        try:
+            future = self._submit_future(self._show_coalesced, (entry,), timeout=timeout,
+                                         priority=self._dialogs[entry.kind].spec.priority)
+        except DialogQueueFull:
+            self._coalescer.close(entry)
+            raise
+
+        # Also covers a dialog cancelled later on, when the handler shuts down
+        future.add_done_callback(lambda done: done.cancelled() and self._coalescer.close(entry))
+
+    @pyqtSlot(object)
+    @_dialog_slot(lambda entry: entry.kind)
+    def _show_coalesced(self, entry:_CoalescedMessage) -> None:
+        """
+        Internal slot that shows a merged info/warning/error dialog in the main thread.
+        """
+        if entry.details is None:
+            msg_box = self._acquire_message_box(entry.kind, entry.title, entry.content, (entry.ok_text,))
+        else:
+            msg_box = self._new_details_dialog(entry.kind, entry.title, entry.content, entry.ok_text, entry.details)
+        entry.box = msg_box
+        self._refresh_coalesced(entry)
+
+        def close():
+            entry.box = None
+            if entry.details is None: self._release_message_box(entry.kind, msg_box)
+            self._coalescer.close(entry)
+
+        return self._await_dialog(msg_box, close, modal=True, dispose=entry.details is not None)
+
+    @pyqtSlot(object)
+    def _refresh_coalesced(self, entry:_CoalescedMessage) -> None:
+        """
+        Internal slot that updates the occurrence count of a shown dialog.
+        """
+        count = self._coalescer.take_count(entry)
+        if entry.box is not None and count > 1:
+            entry.box.setInformativeText(f"Occurred {count} times.")
+
+    @pyqtSlot()
+    def _schedule_drain(self) -> None:
+        """
+        Internal slot that makes sure the backlog of rate limited dialogs is being drained.
+        """
+        if self._drain_scheduled: return
+        self._drain_scheduled = True
+        QTimer.singleShot(0, self._drain_backlog)
+
+    def _drain_backlog(self) -> None:
+        """
+        Show every backlogged dialog whose category has a token again and reschedule for the rest.
+        """
+        self._drain_scheduled = False
+        ready, delay = self._coalescer.pop_ready()
+
+        if delay is not None:
+            self._drain_scheduled = True
+            QTimer.singleShot(max(1, int(delay * 1000)), self._drain_backlog)
+
+        # Queue the dialogs so that a modal dialog does not hold up the rest of the backlog
+        for entry in ready:
+            try:
+                self._submit_coalesced(entry, self.timeout)
+            except DialogQueueFull:
+                pass
+
+    @_dialog_slot("yes_no_batch")
+    def _yes_no_batch_message(self, title, content, items, checked, yes_all_text, no_all_text, ok_text) -> List[bool]:
+        """
+        Internal slot that actually shows the checklist dialog in the main thread.
+        Returns whether each row was ticked.
+        """
+        # Create a custom dialog
+        dialog = QDialog(self.dialog_parent(), Qt.WindowType.WindowStaysOnTopHint)
+        dialog.setWindowTitle(title)
+
+        # Set up layout
+        layout = QVBoxLayout(dialog)
+
+        # Add content label
+        label = QLabel(content)
+        layout.addWidget(label)
+
+        # Add the checklist, a row per item
+        checklist = QListWidget()
+        checklist.setUniformItemSizes(True)
+        state = Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+        for text in items:
+            row = QListWidgetItem(text, checklist)
+            row.setFlags(row.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            row.setCheckState(state)
+        layout.addWidget(checklist)
+
+        # Add the apply to all buttons
+        all_layout = QHBoxLayout()
+        yes_all_button = QPushButton(yes_all_text)
+        no_all_button = QPushButton(no_all_text)
+        all_layout.addWidget(yes_all_button)
+        all_layout.addWidget(no_all_button)
+        layout.addLayout(all_layout)
+
+        def set_all(state):
+            for index in range(checklist.count()):
+                checklist.item(index).setCheckState(state)
+
+        yes_all_button.clicked.connect(lambda: set_all(Qt.CheckState.Checked))
+        no_all_button.clicked.connect(lambda: set_all(Qt.CheckState.Unchecked))
+
+        # Add OK button
+        ok_button = QPushButton(ok_text)
+        ok_button.clicked.connect(dialog.accept)
+        layout.addWidget(ok_button)
+
+        self._set_style(dialog)
+        self._dialog_ready(dialog)
+
+        # Once the dialog is closed, collect the answers
+        def answers():
+            return [checklist.item(index).checkState() == Qt.CheckState.Checked for index in range(checklist.count())]
+
+        return self._await_dialog(dialog, answers)
+
+    @_dialog_slot("yes_no_continue")
+    def _yes_no_continue_message(self, title, content, button_yes, button_no, button_continue) -> int:
+        """
+        Internal slot that actually shows the QMessageBox in the main thread.
+        Returns 0 if user clicked Yes, 1 if user clicked No, 2 if user clicked Continue.
+        """
+        msg_box = self._acquire_message_box("yes_no_continue", title, content,
+                                            (button_yes, button_no, button_continue))
+        yes_button, no_button, continue_button = msg_box.pool_buttons
+
+        # Determine which button was clicked, a timeout closes the box without a click
+        def answer():
+            clicked_button = msg_box.clickedButton()
+            self._release_message_box("yes_no_continue", msg_box)
+
+            if clicked_button == yes_button: return 0
+
+            elif clicked_button == no_button: return 1
+
+            return 2
+
+        return self._await_dialog(msg_box, answer, dispose=False)
+    
+    @staticmethod
+    def _option_at(options:Sequence[str], res:int) -> Optional[str]:
+        """
+        Map the result of `_filtered_combo_box_message` to the selected option.
+        """
+        return options[res] if res >= 0 else None
+
+    @staticmethod
+    def _continue_button_text(res:int, button_yes:str, button_no:str, button_continue:str) -> str:
+        """
+        Map the result of `_yes_no_continue_message` to the text of the clicked button.
+        """
+        if res == 0: return button_yes
+        elif res == 1: return button_no
+        return button_continue
+
+    def _headless_answer(self, kind:str, as_future:bool, title:str, content:str, **fields) -> Any:
+        """
+        Answer a dialog from the headless backend, in the calling thread.
+        """
+        return self._answer_now(self._backend.respond(kind, title, content, **fields), as_future)
+
+    @staticmethod
+    def _answer_now(answer:Any, as_future:bool) -> Any:
+        """
+        Return an answer known without showing a dialog, as a resolved `Future` if the caller asked for one.
+        """
+        if not as_future: return answer
+
+        future = Future()
+        future.set_result(answer)
+        return future
+
+    def _ask_remembered(self,
+                        key:tuple,
+                        slot:Callable,
+                        args:tuple,
+                        convert:Optional[Callable[[Any], Any]],
+                        block:bool,
+                        as_future:bool,
+                        timeout:Optional[float],
+                        default:Any,
+                        priority:int = 2) -> Any:
+        """
+        Show a question the answer cache has no answer for with a "Remember this choice" checkbox,
+        and cache the answer if the user ticks it.
+        """
+        context = _DialogContext(timeout, check_label=self.answer_cache.label)
+
+        def remember(answer):
+            if context.checked: self.answer_cache.put(key, answer)
+
+        return self._dispatch(slot, args, convert, block, as_future, timeout, default, context, remember, priority)
+
+    def _in_main_thread(self) -> bool:
+        """
+        Check if the current thread is the main (GUI) thread.
+        Qt is only asked until the main thread is known, afterwards it is recognized by its identifier.
+        """
+        ident = threading.get_ident()
+        if ident == self._gui_ident: return True
+        if self._gui_ident is not None: return False
+
+        instance = QApplication.instance()
+        if instance and QThread.currentThread() == instance.thread():
+            self._gui_ident = ident
+            return True
+        return False
+
+    def _call_dialog(self, dialog:_DialogType, values:Dict[str, Any]) -> Any:
+        """
+        Run a call of a generated dialog method: answer it headless, from the answer cache
+        or through the storm protection, or dispatch it to the main thread.
+
+        :param dialog: The dialog type.
+        :param values: The values of all parameters of the method, by name.
+        """
+        spec = dialog.spec
+        if spec.normalize is not None: spec.normalize(values)
+        title, content, as_future = values["title"], values["content"], values["as_future"]
+
+        if self._backend is not None:
+            return self._headless_answer(spec.kind, as_future, title, content,
+                                         **{name: values[name] for name in dialog.headless})
+
+        block = values["block"]
+        timeout = values["timeout"]
+        if timeout is None: timeout = self.timeout
+
+        if spec.notice and "details_file" in values:
+            details = self._take_details(values)
+            title, content = values["title"], values["content"]
+            if details is not None: values["details"] = details
+
+        if spec.notice and self.toasts:
+            self.notify(title, content, spec.kind, values["timeout"])
+            return self._answer_now(None, as_future)
+
+        if spec.notice and self._coalescer is not None:
+            self._ensure_gui()
+            return self._post_notice(spec.kind, title, content, values["button_ok"], block, as_future, timeout,
+                                     values.get("details"))
+
+        # A remembered answer doesn't touch Qt
+        key = None
+        if spec.remember is not None and self.answer_cache is not None:
+            key = (spec.kind, title, content, spec.remember(values))
+            answer = self.answer_cache.get(key, _NOT_REMEMBERED)
+            if answer is not _NOT_REMEMBERED: return self._answer_now(answer, as_future)
+
+        # Before the arguments, an image is scaled to the screen
+        self._ensure_gui()
+        slot = MethodType(spec.show, self)
+        args = (spec.arguments(self, values) if spec.arguments is not None
+                else tuple(map(values.__getitem__, dialog.params)))
+        convert = spec.convert(values) if spec.convert is not None else None
+        default = values.get("default")
+
+        if key is not None:
+            return self._ask_remembered(key, slot, args, convert, block, as_future, timeout, default, spec.priority)
+
+        return self._dispatch(slot, args, convert, block, as_future, timeout, default, priority=spec.priority)
+
+    def _take_details(self, values:Dict[str, Any]) -> Optional[_DetailText]:
+        """
+        Move a long content of a notice into its details, leaving a summary, in the calling thread.
+
+        :return: The details, the full content followed by `details_file`, None if there are none.
+        """
+        content = values["content"]
+        text = path = None
+        if len(content) > self.details_threshold:
+            text = content
+            values["content"] = _summarize(content, self.summary_lines)
+        if values["details_file"]:
+            path = os.fspath(values["details_file"])
+
+        return _DetailText(text, path) if text is not None or path is not None else None
+
+    def timed_out(self) -> bool:
+        """
+        Check whether the last dialog with a timeout answered in the calling thread was closed
+        by its timeout, i.e. whether its result is the default answer rather than the user's.
+        Futures carry the same information in their `timed_out` attribute once resolved.
+        """
+        return getattr(self._answers, "timed_out", False)
+
+    def _ask_with_checkbox(self,
+                           label:str,
+                           slot:Callable,
+                           args:tuple,
+                           convert:Optional[Callable[[Any], Any]],
+                           timeout:Optional[float],
+                           default:Any) -> Tuple[Any, bool]:
+        """
+        Show a dialog with an extra checkbox and wait for it.
+
+        :return: The answer, and whether the user ticked the checkbox.
+        """
+        self._ensure_gui()
+        timeout = self.timeout if timeout is None else timeout
+        context = _DialogContext(timeout, check_label=label)
+        answer = self._dispatch(slot, args, convert, True, False, timeout, default, context)
+        return answer, context.checked
+
+    def _dispatch(self,
+                  slot:Callable,
+                  args:tuple,
+                  convert:Optional[Callable[[Any], Any]],
+                  block:bool,
+                  as_future:bool,
+                  timeout:Optional[float] = None,
+                  default:Any = None,
+                  context:Optional[_DialogContext] = None,
+                  on_answer:Optional[Callable[[Any], None]] = None,
+                  priority:int = 2) -> Any:
+        """
+        Dispatch a dialog call to the main thread.
+        A call from the main thread that doesn't want a future runs the dialog right away,
+        as it can't wait for a future only it can complete. Calls that need a future go through `_submit_future`,
+        the others are queued as a single callable.
+        `on_answer` is called with the answer of the user before it is returned, not with a default answer.
+        """
+        if on_answer is not None: convert = partial(self._report_answer, convert, on_answer)
+
+        if not as_future and self._in_main_thread():
+            if context is None and timeout is None and self._metrics is None:
+                res = slot(*args)
+                return convert(res) if convert else res
+
+            if context is None: context = _DialogContext(timeout)
+            if self._metrics is not None:
+                context.timing = DialogTiming(None, threading.current_thread().name, time.perf_counter())
+
+            res = self._hand_over(context, partial(slot, *args))
+            if timeout is not None: self._answers.timed_out = res is _TIMED_OUT
+            return self._convert_answer(convert, default, res)
+
+        if not (as_future or self._future_dispatch or timeout is not None or context is not None):
+            call = partial(slot, *args)
+            if not block:
+                self._queued_call.emit(call)
+                return None
+
+            # The signal returns once the main thread ran the call
+            results = []
+            self._blocking_call.emit(lambda: results.append(call()))
+            if not results: return None
+            return convert(results[0]) if convert else results[0]
+
+        future = self._submit_future(slot, args, convert, priority, timeout, default, context)
+        res = self._wait_future(future, block, as_future)
+        if timeout is not None and block and not as_future:
+            self._answers.timed_out = getattr(future, "timed_out", False)
+        return res
+
+    @staticmethod
+    def _wait_future(future:Future, block:bool, as_future:bool) -> Any:
+        """
+        Return the future itself, or wait for its result if the caller asked to block.
+        A dropped (cancelled) dialog returns None.
+        """
+        if as_future: return future
+        if block and not future.cancelled():
+            try:
+                return future.result()
+            except CancelledError:
+                return None
+
+    @staticmethod
+    def _convert_answer(convert:Optional[Callable[[Any], Any]], default:Any, res:Any) -> Any:
+        """
+        Map a raw slot result to the public result, or to the default answer if the dialog timed out.
+        """
+        if res is _TIMED_OUT: return default
+        return convert(res) if convert else res
+
+    @staticmethod
+    def _report_answer(convert:Optional[Callable[[Any], Any]], on_answer:Callable[[Any], None], res:Any) -> Any:
+        """
+        Map a raw slot result to the public result and pass it to `on_answer`.
+        """
+        answer = convert(res) if convert else res
+        on_answer(answer)
+        return answer
+
+    def _submit_future(self,
+                       slot:Callable,
+                       args:tuple,
+                       convert:Optional[Callable[[Any], Any]] = None,
+                       priority:int = 2,
+                       timeout:Optional[float] = None,
+                       default:Any = None,
+                       context:Optional[_DialogContext] = None) -> Future:
+        """
+        Queue `slot` on the main thread and return a `Future` that the main thread completes.
+        The future can be cancelled until the dialog is shown.
+        With the scheduler, the call may wait for room in the queue depending on the overflow policy.
+
+        :param slot: The internal slot that shows the dialog.
+        :param args: The arguments to pass to the slot.
+        :param convert: Optional callable that maps the raw slot result to the public result.
+        :param priority: The scheduling priority, lower is shown first.
+        :param timeout: Seconds the dialog stays open before it closes itself <Optional>.
+        :param default: The result when the dialog times out.
+        :param context: The context to run the slot with, by default one is made if needed <Optional>.
+
+        :return: The pending future, already cancelled if the scheduler dropped it.
+        """
+        future = Future()
+        call = partial(slot, *args)
+
+        if context is None and (self._metrics is not None or timeout is not None):
+            context = _DialogContext(timeout)
+        if context is not None:
+            if self._metrics is not None:
+                context.timing = DialogTiming(None, threading.current_thread().name, time.perf_counter())
+            call = partial(self._hand_over, context, call)
+
+        if timeout is not None:
+            convert = partial(self._convert_answer, convert, default)
+
+        if self._scheduler is not None:
+            request = (future, call, convert)
+            if not self._scheduler.put(priority, request, wait=not self._in_main_thread()):
+                future.cancel()
+                return future
+
+            self._post(self._pump_scheduler.__name__)
+            return future
+
+        # A queued call returns immediately, even when made from the main thread itself
+        if not self._post(self._run_future.__name__, future, call, convert): future.cancel()
+        return future
+
+    def _post(self, slot_name:str, *args) -> bool:
+        """
+        Queue a call of an internal slot in the main (GUI) thread, the arguments are passed as objects.
+
+        :return: False if the handler's GUI thread has ended and nothing was queued.
+        """
+        if self._gui_thread is None:
+            QMetaObject.invokeMethod(self, slot_name, Qt.ConnectionType.QueuedConnection,
+                                     *[Q_ARG(object, arg) for arg in args])
+            return True
+
+        with self._gui_thread.lock:
+            if not self._gui_thread.accepting: return False
+            QMetaObject.invokeMethod(self, slot_name, Qt.ConnectionType.QueuedConnection,
+                                     *[Q_ARG(object, arg) for arg in args])
+            return True
+
+    def _run_in_gui_thread(self, call:Callable) -> Any:
+        """
+        Run `call` in the handler's own GUI thread, if it has one, and return its result.
+        Returns None once the GUI thread has ended, like the dialogs of a handler that was shut down.
+        """
+        if self._gui_thread is None or self._in_main_thread(): return call()
+
+        future = Future()
+        # The GUI thread cancels the calls still queued when it ends, and accepts none after
+        if not self._post(self._run_future.__name__, future, call, None): return None
+        try:
+            return future.result()
+        except CancelledError:
+            return None
+
+    @pyqtSlot()
+    def _close_gui(self) -> None:
+        """
+        Internal slot that closes the open dialogs and ends the event loop of the GUI thread.
+        """
+        QApplication.closeAllWindows()
+        # Also ends the event loops of the dialogs still running
+        QApplication.quit()
+
+    def _finish_gui_thread(self) -> None:
+        """
+        Runs in the GUI thread once its event loop ended: cancels the dialog calls still queued,
+        so that no caller waits forever.
+        """
+        self._closed = True
+        # No other thread may pass for the GUI thread once it ended and its identifier is reused
+        self._gui_ident = -1
+        if self._scheduler is not None: self._scheduler.close()
+        # Queued calls cancel their future instead of showing a dialog now
+        QApplication.sendPostedEvents()
+        if self._coalescer is not None: self._coalescer.close_all()
+
+    @staticmethod
+    def _await_future(future:Future) -> "asyncio.Future":
+        """
+        Wrap a dialog future into an asyncio future of the running loop.
+        The main thread resolves it through `loop.call_soon_threadsafe`, cancelling it cancels the dialog future.
+        """
+        # Imported on first use, it weighs on the start-up of the programs that never await a dialog
+        import asyncio
+        return asyncio.wrap_future(future, loop=asyncio.get_running_loop())
+
+    @pyqtSlot()
+    def _pump_scheduler(self) -> None:
+        """
+        Internal slot that shows the most urgent queued dialog if another one may be visible.
+        Runs again whenever a dialog is queued or closed.
+        """
+        request = self._scheduler.acquire()
+        if request is None: return
+
+        # A modeless dialog keeps its place until it is closed, after the slot returned
+        self._start_future(*request, closed=self._release_scheduled)
+
+    def _release_scheduled(self) -> None:
+        """
+        Free the place of a closed scheduled dialog and show the next one.
+        """
+        self._scheduler.release()
+        self._post(self._pump_scheduler.__name__)
+
+    @pyqtSlot(object)
+    def _run_call(self, call:Callable[[], Any]) -> None:
+        """
+        Internal slot that runs a call queued by `_dispatch` in the main thread.
+        """
+        call()
+
+    @pyqtSlot(object, object, object)
+    def _run_future(self, future:Future, call:Callable, convert:Optional[Callable[[Any], Any]]) -> None:
+        """
+        Internal slot that runs a dialog in the main thread and completes its future.
+        """
+        self._start_future(future, call, convert)
+
+    def _start_future(self,
+                      future:Future,
+                      call:Callable,
+                      convert:Optional[Callable[[Any], Any]],
+                      closed:Optional[Callable[[], None]] = None) -> None:
+        """
+        Run a dialog in the main thread and complete its future once the dialog is closed.
+        A `modeless` handler, or a call with a timeout, hands the completion to the dialog slot,
+        which may return before that.
+
+        :param closed: Called once the dialog is closed, or right away if it isn't shown <Optional>.
+        """
+        # A handler shutting down doesn't show any more dialogs,
+        # and a dialog cancelled by its caller while it was queued is skipped entirely
+        if self._closed or not future.set_running_or_notify_cancel():
+            if self._closed: future.cancel()
+            if closed is not None: closed()
+            return
+
+        done = partial(self._complete_future, future, convert, closed)
+        # The dialog slot decides whether the dialog completes the future, see `_dialog_slot`
+        self._on_done = done
+        try:
+            res = call()
+        except BaseException as exc:
+            done(None, exc)
+            return
+        finally:
+            self._on_done = None
+
+        if res is not _PENDING: done(res, None)
+
+    @staticmethod
+    def _complete_future(future:Future,
+                         convert:Optional[Callable[[Any], Any]],
+                         closed:Optional[Callable[[], None]],
+                         res:Any,
+                         exc:Optional[BaseException]) -> None:
+        """
+        Complete the future of a closed dialog with its converted result, or with the exception it raised.
+        """
+        try:
+            if exc is not None: raise exc
+            # Set before the result, so a waiting thread always sees it
+            future.timed_out = res is _TIMED_OUT
+            future.set_result(convert(res) if convert else res)
+        except BaseException as error:
+            future.set_exception(error)
+        finally:
+            if closed is not None: closed()
+
+    def _set_style(self, widget:QWidget) -> None:
+        """
+        Set the style of the widget to the specified style.
+        """
+        style = self.style
+        if style is None: return
+
+        widget.setStyle(style)
+
+        # A palette is applied directly, a stylesheet would be parsed again for every widget
+        if self._palette is not None: widget.setPalette(self._palette)
+
+        widget.ensurePolished()
+
+
+def _normalize_options(values:Dict[str, Any]) -> None:
+    if values["options"] is None: values["options"] = [""]
+
+
+def _normalize_batch(values:Dict[str, Any]) -> None:
+    items = values["items"]
+    values["items"] = items = [str(item) for item in items] if items is not None else []
+    if values["default"] is None: values["default"] = [values["checked"]] * len(items)
+
+
+def _normalize_image_path(values:Dict[str, Any]) -> None:
+    values["image_path"] = values["image_path"] or ""
+
+
+def _filtered_combo_box_arguments(handler:MessageBoxHandler, values:Dict[str, Any]) -> tuple:
+    # The filter index is built here, in the calling thread
+    options = values["options"]
+    index = _OptionIndex(options) if values["filterable"] else None
+    return values["title"], values["content"], values["button_ok"], options, index
+
+
+def _instruction_arguments(handler:MessageBoxHandler, values:Dict[str, Any]) -> tuple:
+    # Decode here, so the main thread only has to convert the image to a pixmap
+    image_path = values["image_path"]
+    return values["title"], values["content"], values["button_ok"], image_path, handler._load_image(image_path)
+
+
+def _notice_arguments(handler:MessageBoxHandler, values:Dict[str, Any]) -> tuple:
+    # The details of a long content were split off by `_take_details`
+    return values["title"], values["content"], values["button_ok"], values.get("details")
+
+
+def _notice_spec(name:str, kind:str, show:Callable[..., Any], title:str, content:str, doc:str,
+                 priority:int) -> DialogSpec:
+    return DialogSpec(name, kind, show,
+                      (("title", title), ("content", content), ("button_ok", "OK")),
+                      doc=doc, answers=False, priority=priority, arguments=_notice_arguments,
+                      headless=("button_ok",), notice=True, keyword_params=(("details_file", None),))
+
+
+# The dialogs every handler has, the public methods are generated from them
+_BUILTIN_DIALOGS = (
+    DialogSpec(
+        "yes_no_message", "yes_no", MessageBoxHandler._yes_no_message,
+        (("title", "Title"), ("content", "Content"), ("button_yes", "Yes"), ("button_no", "No")),
+        doc="""
+        Show a message box with Yes and No buttons (Specified by the user).
+        Returns True if the user clicks Yes, False if the user clicks No.
+
+        :param title: The title of the message box.
+        :param content: The content of the message box.
+        :param button_yes: The text to display on the Yes button.
+        :param button_no: The text to display on the No button.
+        :param block: Whether to block the current thread until the message box is closed default is True.
+        :param as_future: Return a `Future` resolved with the answer instead of waiting for it. Default is False.
+        :param timeout: Seconds before the dialog closes itself, by default the handler's `timeout` <Optional>.
+        :param default: The answer returned when the dialog times out. Default is False.
+
+        :return: True if the user clicks Yes, False if the user clicks No.
+        """,
+        default=False, remember=itemgetter("button_yes", "button_no")),
+    DialogSpec(
+        "yes_no_continue_message", "yes_no_continue", MessageBoxHandler._yes_no_continue_message,
+        (("title", "Title"), ("content", "Content"), ("button_yes", "Yes"), ("button_no", "No"),
+         ("button_continue", "Continue")),
+        doc="""
+        Show a message box with 3 buttons: Yes, No, and Continue (Specified by the user).
+
+        :param title: The title of the message box.
+        :param content: The content of the message box.
+        :param button_yes: The text to display on the Yes button.
+        :param button_no: The text to display on the No button.
+        :param button_continue: The text to display on the Continue button.
+        :param block: Whether to block the current thread until the message box is closed default is True.
+        :param as_future: Return a `Future` resolved with the clicked button text instead of waiting for it. Default is False.
+        :param timeout: Seconds before the dialog closes itself, by default the handler's `timeout` <Optional>.
+        :param default: The answer returned when the dialog times out. Default is None.
+
+        :return: The text of the button that was clicked.
+        """,
+        convert=lambda values: partial(MessageBoxHandler._continue_button_text, button_yes=values["button_yes"],
+                                       button_no=values["button_no"], button_continue=values["button_continue"]),
+        remember=itemgetter("button_yes", "button_no", "button_continue")),
+    DialogSpec(
+        "yes_no_batch_message", "yes_no_batch", MessageBoxHandler._yes_no_batch_message,
+        (("title", "Title"), ("content", "Content"), ("items", None), ("checked", False),
+         ("button_yes_all", "Yes to all"), ("button_no_all", "No to all"), ("button_ok", "OK")),
+        doc="""
+        Ask the same Yes/No question about many items in one dialog, instead of a `yes_no_message` per item.
+        The dialog shows a checklist with a row per item, a ticked row is a Yes.
+
+        :param title: The title of the dialog.
+        :param content: The question.
+        :param items: The items to decide on, shown as the rows of the checklist.
+        :param checked: Whether the rows start ticked. Default is False.
+        :param button_yes_all: The text of the button ticking every row.
+        :param button_no_all: The text of the button clearing every row.
+        :param button_ok: The text of the button confirming the answers.
+        :param block: Whether to block the current thread until the dialog is closed default is True.
+        :param as_future: Return a `Future` resolved with the answers instead of waiting for them. Default is False.
+        :param timeout: Seconds before the dialog closes itself, by default the handler's `timeout` <Optional>.
+        :param default: The answers returned when the dialog times out. Default is `checked` for every item.
+
+        :return: True (Yes) or False (No) for every item, in the order of the items.
+        """,
+        normalize=_normalize_batch, headless=("items", "checked")),
+    _notice_spec(
+        "info_message", "info", MessageBoxHandler._info_message, "Information", "Here is some information.", """
+        Show `Information` message box with an OK button.
+
+        :param title: The title of the message box.
+        :param content: The content of the message box.
+        :param button_ok: The text to display on the OK button.
+        :param block: Whether to block the current thread until the message box is closed default is True.
+        :param as_future: Return a `Future` resolved when the message box is closed instead of waiting for it. Default is False.
+        :param timeout: Seconds before the dialog closes itself, by default the handler's `timeout` <Optional>.
+        :param details_file: A file, e.g. a log, shown in the details view of the dialog, keyword-only <Optional>.
+                             Read only when the user expands the details. A content longer than the handler's
+                             `details_threshold` is shown as a summary, with the full text in the details, before the file.
+        """, priority=3),
+    _notice_spec(
+        "warning_message", "warning", MessageBoxHandler._warning_message, "Warning", "This is a warning.", """
+        Show a `Warning` message box with an OK button.
+
+        :param title: The title of the message box.
+        :param content: The content of the message box.
+        :param button_ok: The text to display on the OK button.
+        :param block: Whether to block the current thread until the message box is closed default is True.
+        :param as_future: Return a `Future` resolved when the message box is closed instead of waiting for it. Default is False.
+        :param timeout: Seconds before the dialog closes itself, by default the handler's `timeout` <Optional>.
+        :param details_file: A file, e.g. a log, shown in the details view of the dialog, keyword-only <Optional>.
+                             Read only when the user expands the details. A content longer than the handler's
+                             `details_threshold` is shown as a summary, with the full text in the details, before the file.
+        """, priority=1),
+    _notice_spec(
+        "error_message", "error", MessageBoxHandler._error_message, "Error", "An error occurred.", """
+        Show an `Error` message box with an OK button.
+
+        :param title: The title of the message box.
+        :param content: The content of the message box.
+        :param button_ok: The text to display on the OK button.
+        :param block: Whether to block the current thread until the message box is closed default is True.
+        :param as_future: Return a `Future` resolved when the message box is closed instead of waiting for it. Default is False.
+        :param timeout: Seconds before the dialog closes itself, by default the handler's `timeout` <Optional>.
+        :param details_file: A file, e.g. a log, shown in the details view of the dialog, keyword-only <Optional>.
+                             Read only when the user expands the details. A content longer than the handler's
+                             `details_threshold` is shown as a summary, with the full text in the details, before the file.
+        """, priority=0),
+    DialogSpec(
+        "combo_box_message", "combo_box", MessageBoxHandler._combo_box_message,
+        (("title", "Title"), ("content", "Content"), ("button_ok", "OK"), ("options", None)),
+        doc="""
+        Show a message box with a combo box containing the specified options.
+        Returns the selected option.
+
+        :param title: The title of the message box.
+        :param content: The content of the message box.
+        :param button_ok: The text to display on the OK button.
+        :param options: A list of options to display in the combo box.
+        :param block: Whether to block the current thread until the message box is closed default is True.
+        :param as_future: Return a `Future` resolved with the selected option instead of waiting for it. Default is False.
+        :param timeout: Seconds before the dialog closes itself, by default the handler's `timeout` <Optional>.
+        :param default: The answer returned when the dialog times out. Default is None.
+
+        :return: The selected option.
+        """,
+        normalize=_normalize_options,
+        convert=lambda values: values["options"].__getitem__,
+        remember=lambda values: tuple(values["options"])),
+    DialogSpec(
+        "filtered_combo_box_message", "filtered_combo_box", MessageBoxHandler._filtered_combo_box_message,
+        (("title", "Title"), ("content", "Content"), ("button_ok", "OK"), ("options", None), ("filterable", True)),
+        doc="""
+        Show a combo box for very large or lazily loaded option lists, with a type-to-filter box.
+        The options are shared with the main thread instead of copied, and rows are only read
+        when the list is scrolled to them. Any sequence works, including one that loads its items on access.
+
+        :param title: The title of the message box.
+        :param content: The content of the message box.
+        :param button_ok: The text to display on the OK button.
+        :param options: A sequence of options to display in the combo box.
+        :param filterable: Whether to show the filter box. The filter index is built in the calling thread
+                           and reads every option once. Default is True.
+        :param block: Whether to block the current thread until the message box is closed default is True.
+        :param as_future: Return a `Future` resolved with the selected option instead of waiting for it. Default is False.
+        :param timeout: Seconds before the dialog closes itself, by default the handler's `timeout` <Optional>.
+        :param default: The answer returned when the dialog times out. Default is None.
+
+        :return: The selected option, or None if nothing was selected.
+        """,
+        normalize=_normalize_options, arguments=_filtered_combo_box_arguments,
+        convert=lambda values: partial(MessageBoxHandler._option_at, values["options"]),
+        headless=("button_ok", "options")),
+    DialogSpec(
+        "instruction_message_with_image", "instruction", MessageBoxHandler._instruction_message_with_image,
+        (("title", "Instructions"), ("content", "Please follow these instructions:"), ("button_ok", "Close"),
+         ("image_path", None)),
+        doc="""
+        Show a message box with instructions and an image.
+
+        :param title: The title of the message box.
+        :param content: The instructions to display.
+        :param button_ok: The text to display on the OK button.
+        :param image_path: The path to the image file to display.
+        :param block: Whether to block the current thread until the message box is closed default is True.
+        :param as_future: Return a `Future` resolved when the dialog is closed instead of waiting for it. Default is False.
+        :param timeout: Seconds before the dialog closes itself, by default the handler's `timeout` <Optional>.
+
+        :return: None
+        """,
+        answers=False, normalize=_normalize_image_path, arguments=_instruction_arguments),
+)
+
+for _spec in _BUILTIN_DIALOGS:
+    MessageBoxHandler._add_dialog(_spec)
+
+
+def _json_default(value:Any) -> Any:
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return None
+    return value
+
+
+class DialogServer:
+    """
+    Serves the dialogs of a `MessageBoxHandler` to other processes over a local connection,
+    a Unix socket (or a named pipe on Windows). Worker processes use a `DialogClient`, see `client`.
+    Every client connection is read by its own thread, its calls are dispatched to the handler as futures
+    and answered as they complete, so calls from many processes are in flight at the same time.
+    The handler needs a running event loop, e.g. with `gui_thread=True`.
+    """
+    def __init__(self,
+                 handler:MessageBoxHandler,
+                 address:Any = None,
+                 authkey:Optional[bytes] = None,
+                 family:Optional[str] = None) -> None:
+        """
+        :param handler: The handler showing the dialogs.
+        :param address: The address to listen on <Optional>. Default is a new temporary socket.
+        :param authkey: The key clients must authenticate with <Optional>. Default is a random key.
+        :param family: The connection family, see `multiprocessing.connection.Listener` <Optional>.
+        """
+        self.handler = handler
+        # Imported on first use, only a server needs multiprocessing
+        from multiprocessing.connection import Listener
+
+        self.authkey = os.urandom(32) if authkey is None else authkey
+        self._listener = Listener(address, family, authkey=self.authkey)
+        self.address = self._listener.address
+        self._lock = threading.Lock()
+        self._connections = set()
+        self._closed = False
+        self._thread = None
+
+    def client(self) -> DialogClient:
+        """
+        :return: A client of this server. It can be pickled and passed to worker processes.
+        """
+        return DialogClient(self.address, self.authkey)
+
+    def start(self) -> "DialogServer":
+        """
+        Start accepting clients in a background thread.
+        """
+        self._thread = threading.Thread(target=self._accept, name="DialogServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """
+        Stop accepting clients and close every connection. Calls still waiting fail in their clients.
+        """
+        with self._lock:
+            self._closed = True
+            connections = list(self._connections)
+            self._connections.clear()
+
+        self._listener.close()
+        for conn in connections:
+            conn.close()
+
+    def __enter__(self) -> "DialogServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _accept(self) -> None:
+        from multiprocessing import AuthenticationError
+
+        while True:
+            try:
+                conn = self._listener.accept()
+            except AuthenticationError:
+                continue
+            except OSError:
+                # Closing the listener ends the thread
+                if self._closed: return
+                continue
+
+            with self._lock:
+                if self._closed:
+                    conn.close()
+                    return
+                self._connections.add(conn)
+
+            threading.Thread(target=self._serve, args=(conn,), name="DialogServerConnection", daemon=True).start()
+
+    def _serve(self, conn) -> None:
+        """
+        Read the calls of one client until it disconnects.
+        """
+        send_lock = threading.Lock()
+        try:
+            while True:
+                request_id, method, args, kwargs = decode_message(conn.recv_bytes())
+                self._dispatch(conn, send_lock, request_id, method, args, kwargs)
+        except (EOFError, OSError, TypeError):
+            # TypeError: `close` closed the connection while it was being read
+            pass
+        finally:
+            # Unless `close` took the connection, which closes it then
+            with self._lock:
+                owned = conn in self._connections
+                self._connections.discard(conn)
+            if owned: conn.close()
+
+    def _dispatch(self, conn, send_lock:threading.Lock, request_id:int, method:str, args:list, kwargs:dict) -> None:
+        if method == DIALOGS_REQUEST:
+            self._reply(conn, send_lock, [request_id, True, self._dialog_table(), False])
+            return
+
+        try:
+            if method not in self._dialog_names(): raise AttributeError(f"Unknown dialog method: {method!r}")
+            future = getattr(self.handler, method)(*args, as_future=True, **kwargs)
+        except Exception as exc:
+            self._reply(conn, send_lock, [request_id, False, [type(exc).__name__, str(exc)], False])
+            return
+
+        future.add_done_callback(partial(self._on_done, conn, send_lock, request_id))
+
+    def _dialog_names(self) -> Set[str]:
+        return {dialog.spec.name for dialog in type(self.handler)._dialogs.values()}
+
+    def _dialog_table(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Describe the dialog methods of the handler, the registered ones included, for `DialogClient`.
+
+        :return: The parameters of every method as [name, default, keyword-only] triples and its docstring, by name.
+        """
+        table = {}
+        for dialog in type(self.handler)._dialogs.values():
+            keyword_only = {name for name, _ in dialog.spec.keyword_params}
+            table[dialog.spec.name] = {
+                # A default that can't be sent shows as None, the client leaves out the arguments it wasn't passed
+                "params": [[name, _json_default(default), name in keyword_only]
+                           for name, default in dialog.defaults.items()],
+                "doc": dialog.spec.doc,
+            }
+        return table
+
+    def _on_done(self, conn, send_lock:threading.Lock, request_id:int, future:Future) -> None:
+        """
+        Send the answer of a completed call back to its client. Runs in the thread that completed it.
+        """
+        if future.cancelled():
+            # A dropped dialog returns None, as it does in-process
+            reply = [request_id, True, None, False]
+        elif future.exception() is not None:
+            exc = future.exception()
+            reply = [request_id, False, [type(exc).__name__, str(exc)], False]
+        else:
+            reply = [request_id, True, future.result(), getattr(future, "timed_out", False)]
+
+        self._reply(conn, send_lock, reply)
+
+    @staticmethod
+    def _reply(conn, send_lock:threading.Lock, reply:list) -> None:
+        try:
+            with send_lock:
+                conn.send_bytes(encode_message(reply))
+        except OSError:
+            # The client is gone, nobody is waiting for the answer
+            pass
+
+
+# Example usage
+if __name__ == "__main__":
+    handler = MessageBoxHandler()
+    
+    # Yes/No message
+    res = handler.yes_no_message(
+                                title="Confirmation",
+                                content="Do you want to proceed?",
+                                button_yes="Proceed",
+                                button_no="Cancel")
+    
+    print("User selected:", "Yes" if res else "No")
+    
+    # Information message
+    handler.info_message(
+        title="Update",
+        content="The operation completed successfully.",
+        button_ok="Got it"
+    )
+    
+    # Warning message
+    handler.warning_message(
+        title="Low Disk Space",
+        content="You are running low on disk space.",
+        button_ok="Understood"
+    )
+    
+    # Error message
+    handler.error_message(
+        title="Connection Error",
+        content="Failed to connect to the server.",
+        button_ok="Retry"
+    )
+
+        # Yes/No/Continue message
+    
+    # Yes/No/Continue message
+    response = handler.yes_no_continue_message(
+        title="Decision",
+        content="Please choose an option:",
+        button_yes="Yes",
+        button_no="No",
+        button_continue="Continue"
+    )
+    print("User selected:", response)
+
+    # Combo box message
+    selected_option = handler.combo_box_message(
+        title="Select Fruit",
+        content="Choose your favorite fruit:",
+        options=["Apple", "Banana", "Cherry", "Date"]
+    )
+    print("User selected:", selected_option)
+
+    # Instruction message with image
+    handler.instruction_message_with_image(
+        title="Welcome",
+        content="Please refer to the image below:",
+        image_path=""  # Replace with an actual image path
+    )
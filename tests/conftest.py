@@ -0,0 +1,21 @@
+"""
+Shared set-up of the tests: Qt runs without a display, and the modules are imported from the checkout.
+"""
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def app():
+    """
+    The QApplication of the tests showing dialogs in this process.
+    Kept for the whole run: the shared styles of the handlers die with the QApplication that created them.
+    """
+    from PyQt5.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,112 @@
+"""
+`AnswerCache` on its own, on a fake clock, and behind a handler showing its questions in this process.
+"""
+import types
+from typing import Optional
+
+import pytest
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication, QCheckBox
+
+import qt_user_massages_qt
+from qt_user_massages import MessageBoxHandler, AnswerCache
+
+
+def key(title:str) -> tuple:
+    return ("yes_no", title, "Content", ("Yes", "No"))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(qt_user_massages_qt, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_get_and_put():
+    cache = AnswerCache()
+    assert cache.get(key("A")) is None
+    assert cache.get(key("A"), "missing") == "missing"
+
+    cache.put(key("A"), False)
+    assert cache.get(key("A"), "missing") is False
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_ttl(clock):
+    cache = AnswerCache(ttl=10)
+    cache.put(key("A"), True)
+    clock[0] += 5
+    cache.put(key("B"), True)
+    assert [entry["expires_in"] for entry in cache.entries()] == [5, 10]
+
+    clock[0] += 5
+    assert cache.get(key("A"), "missing") == "missing"
+    assert cache.get(key("B")) is True
+    assert len(cache) == 1
+
+    clock[0] += 5
+    assert cache.entries() == []
+
+
+def test_lru_eviction():
+    cache = AnswerCache(max_entries=2)
+    cache.put(key("A"), True)
+    cache.put(key("B"), True)
+    # Using A makes B the least recently used
+    cache.get(key("A"))
+    cache.put(key("C"), True)
+
+    assert [entry["title"] for entry in cache.entries()] == ["A", "C"]
+
+
+def test_invalidate():
+    cache = AnswerCache()
+    cache.put(("yes_no", "A", "One", ("Yes", "No")), True)
+    cache.put(("yes_no", "A", "Two", ("Yes", "No")), True)
+    cache.put(("combo_box", "A", "One", ("x", "y")), "x")
+    cache.put(("yes_no", "B", "One", ("Yes", "No")), True)
+
+    assert cache.invalidate(kind="yes_no", title="A") == 2
+    assert cache.invalidate(content="Two") == 0
+    assert cache.invalidate(title="A") == 1
+    assert cache.invalidate() == 1
+    assert len(cache) == 0
+
+
+def test_session_cache_is_shared():
+    assert MessageBoxHandler(answer_cache="session").answer_cache is AnswerCache.session()
+    assert MessageBoxHandler(answer_cache="handler").answer_cache is not AnswerCache.session()
+
+
+def tick_remember(title:str, button:Optional[str] = None) -> None:
+    """
+    Tick "Remember this choice" in the visible dialog titled `title`, then click the button with the text `button`.
+    """
+    for widget in QApplication.topLevelWidgets():
+        if widget.isVisible() and widget.windowTitle().startswith(title):
+            widget.findChild(QCheckBox).setChecked(True)
+            for clicked in widget.buttons():
+                if clicked.text() == button: clicked.click()
+
+
+def test_ticked_answer_is_remembered(app):
+    cache = AnswerCache()
+    handler = MessageBoxHandler(answer_cache=cache)
+
+    QTimer.singleShot(100, lambda: tick_remember("Remembered", "No"))
+    assert handler.yes_no_message("Remembered", "Content", default=True) is False
+    assert cache.get(key("Remembered"), "missing") is False
+
+    # Answered from the cache, nothing is shown
+    assert handler.yes_no_message("Remembered", "Content", timeout=0.01, default=True) is False
+
+
+def test_timeouts_are_never_remembered(app):
+    cache = AnswerCache()
+    handler = MessageBoxHandler(answer_cache=cache)
+
+    QTimer.singleShot(100, lambda: tick_remember("Timed"))
+    assert handler.yes_no_message("Timed", "Content", timeout=0.5, default=True) is True
+    assert handler.timed_out()
+    assert len(cache) == 0
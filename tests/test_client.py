@@ -0,0 +1,108 @@
+"""
+`DialogClient` against a `DialogServer` serving a headless handler, in this process.
+"""
+import inspect
+import pickle
+import threading
+from concurrent.futures import CancelledError
+
+import pytest
+
+from qt_user_massages import MessageBoxHandler, HeadlessBackend, DialogServer, DialogSpec
+from qt_user_massages_client import RemoteDialogError
+
+
+class RatingHandler(MessageBoxHandler):
+    pass
+
+
+def show_rating(handler, title, content, stars):
+    raise AssertionError("A headless handler never shows a dialog")
+
+
+RatingHandler.register_dialog(DialogSpec("rating_message", "rating", show_rating,
+                                         (("title", "Rating"), ("content", "How was it?"), ("stars", 5))))
+
+# Set by a test to hold back the answers to the dialogs titled "Slow"
+release = threading.Event()
+# Set once the server started answering one of them
+answering = threading.Event()
+
+
+def respond(prompt):
+    if prompt.title == "Slow":
+        answering.set()
+        release.wait(10)
+    return None
+
+
+@pytest.fixture
+def server():
+    release.clear()
+    answering.clear()
+    # "maybe" is no button of a yes_no_continue_message, answering it fails
+    answers = {"yes_no": False, "yes_no_continue": "maybe", "rating": 4}
+    handler = RatingHandler(backend=HeadlessBackend(answers=answers, responder=respond))
+    with DialogServer(handler) as server:
+        yield server
+    release.set()
+
+
+def test_methods_have_the_handler_signatures(server):
+    client = server.client()
+    for name in ("yes_no_message", "yes_no_batch_message", "info_message", "filtered_combo_box_message"):
+        method = getattr(client, name)
+        assert inspect.signature(method) == inspect.signature(getattr(server.handler, name))
+        assert method.__doc__ == getattr(server.handler, name).__doc__
+    assert not hasattr(client, "ayes_no_message")
+    assert not hasattr(client, "unknown_message")
+
+
+def test_round_trip(server):
+    client = pickle.loads(pickle.dumps(server.client()))
+    assert client.yes_no_message("Delete", "Delete it?") is False
+    assert client.yes_no_batch_message("Delete", "Delete them?", items=(str(item) for item in range(3))) == [True] * 3
+    # Positional block=False, as with the handler
+    assert client.info_message("Done", "Deleted.", "OK", False) is None
+    assert client.rating_message(stars=3) == 4
+    assert not client.timed_out()
+
+
+def test_remote_error(server):
+    client = server.client()
+    with pytest.raises(RemoteDialogError) as error:
+        client.yes_no_continue_message("Go on", "Continue?")
+    assert error.value.kind == "ValueError"
+    # A pool worker raising it sends it pickled to its parent
+    copy = pickle.loads(pickle.dumps(error.value))
+    assert (copy.kind, str(copy)) == (error.value.kind, str(error.value))
+    with pytest.raises(RemoteDialogError, match="AttributeError"):
+        client._call("shutdown", [], {}, True, False)
+    with pytest.raises(TypeError):
+        client.yes_no_message(button_maybe="Maybe")
+
+
+def test_cancelled_future_does_not_break_the_client(server):
+    client = server.client()
+    slow = client.yes_no_message("Slow", "Cancelled before its reply", as_future=True)
+    assert slow.cancel()
+    release.set()
+
+    # The futures time out instead of hanging the tests, should the reader thread have died
+    assert client.yes_no_message("Fast", "Answered?", as_future=True).result(timeout=5) is False
+    assert client.yes_no_message("Fast", "Still answered?", as_future=True).result(timeout=5) is False
+    with pytest.raises(CancelledError):
+        slow.result(timeout=0)
+
+
+def test_invalid_reply_fails_the_waiting_calls_and_reconnects(server):
+    client = server.client()
+    future = client.yes_no_message("Slow", "Waiting", as_future=True)
+    assert answering.wait(5)
+    # A reply the client can't unpack ends its reader thread
+    server._reply(next(iter(server._connections)), threading.Lock(), ["not", "a", "reply"])
+
+    with pytest.raises(ConnectionError):
+        future.result(timeout=5)
+    release.set()
+    assert client.yes_no_message("Fast", "Connected again?", as_future=True).result(timeout=5) is False
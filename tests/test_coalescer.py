@@ -0,0 +1,118 @@
+"""
+Merging and rate limiting of duplicate notices, on a fake clock. No dialog is shown.
+"""
+import types
+
+import pytest
+
+import qt_user_massages_qt
+from qt_user_massages import _TokenBucket, _MessageCoalescer, _DetailText
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(qt_user_massages_qt, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_token_bucket(clock):
+    bucket = _TokenBucket(rate=2.0, burst=2)
+    assert bucket.take() and bucket.take()
+    assert not bucket.take()
+    assert bucket.wait_time() == pytest.approx(0.5)
+
+    clock[0] += 0.5
+    assert bucket.take()
+    assert not bucket.take()
+
+    # Never saves up more than the burst
+    clock[0] += 60
+    assert [bucket.take() for _ in range(3)] == [True, True, False]
+
+
+def test_duplicates_within_the_window_are_merged(clock):
+    coalescer = _MessageCoalescer(window=1.0, rate=10.0, burst=5, max_backlog=10)
+    first, action = coalescer.post("error", "Failed", "Disk full", "OK")
+    assert action == _MessageCoalescer.SHOW
+
+    for _ in range(3):
+        clock[0] += 0.5
+        entry, action = coalescer.post("error", "Failed", "Disk full", "OK")
+        assert (entry, action) == (first, _MessageCoalescer.MERGED)
+    assert coalescer.take_count(first) == 4
+
+    # The window starts again at the last occurrence
+    clock[0] += 1.5
+    _, action = coalescer.post("error", "Failed", "Disk full", "OK")
+    assert action == _MessageCoalescer.SHOW
+
+    coalescer.close(first)
+    assert first.closed.result(0) == 4
+
+
+def test_different_messages_are_not_merged(clock):
+    coalescer = _MessageCoalescer(window=1.0, rate=10.0, burst=5, max_backlog=10)
+    first, _ = coalescer.post("error", "Failed", "Disk full", "OK")
+
+    for post in [("warning", "Failed", "Disk full", "OK"), ("error", "Failed", "Disk busy", "OK"),
+                 ("error", "Failed", "Disk full", "OK", _DetailText("trace"))]:
+        entry, action = coalescer.post(*post)
+        assert entry is not first and action == _MessageCoalescer.SHOW
+
+
+def test_closed_message_is_shown_again(clock):
+    coalescer = _MessageCoalescer(window=1.0, rate=10.0, burst=5, max_backlog=10)
+    first, _ = coalescer.post("info", "Saved", "Saved", "OK")
+    coalescer.close(first)
+
+    entry, action = coalescer.post("info", "Saved", "Saved", "OK")
+    assert entry is not first and action == _MessageCoalescer.SHOW
+
+
+def test_rate_limit_queues_then_drops(clock):
+    coalescer = _MessageCoalescer(window=1.0, rate=1.0, burst=1, max_backlog=2)
+    actions = [coalescer.post("error", "Failed", f"Error {i}", "OK")[1] for i in range(4)]
+    assert actions == ["show", "queued", "queued", "dropped"]
+    assert coalescer.dropped == 1
+
+    # Other categories have their own tokens
+    assert coalescer.post("info", "Done", "Done", "OK")[1] == _MessageCoalescer.SHOW
+
+    ready, delay = coalescer.pop_ready()
+    assert ready == [] and delay == pytest.approx(1.0)
+
+    clock[0] += 1.0
+    ready, delay = coalescer.pop_ready()
+    assert [entry.content for entry in ready] == ["Error 1"]
+    assert delay == pytest.approx(1.0)
+
+    clock[0] += 1.0
+    ready, delay = coalescer.pop_ready()
+    assert [entry.content for entry in ready] == ["Error 2"] and delay is None
+
+
+def test_dropped_and_closed_messages_release_their_callers(clock):
+    coalescer = _MessageCoalescer(window=1.0, rate=1.0, burst=1, max_backlog=1)
+    shown, _ = coalescer.post("error", "Failed", "Error 0", "OK")
+    queued, _ = coalescer.post("error", "Failed", "Error 1", "OK")
+    dropped, action = coalescer.post("error", "Failed", "Error 2", "OK")
+    assert action == _MessageCoalescer.DROPPED and dropped.closed.result(0) == 0
+
+    coalescer.close_all()
+    assert shown.closed.result(0) == 1 and queued.closed.result(0) == 1
+    assert coalescer.pop_ready() == ([], None)
+
+
+def test_refresh_is_queued_once_until_the_count_is_read(clock):
+    coalescer = _MessageCoalescer(window=1.0, rate=10.0, burst=5, max_backlog=10)
+    entry, _ = coalescer.post("error", "Failed", "Disk full", "OK")
+
+    assert coalescer.request_refresh(entry)
+    assert not coalescer.request_refresh(entry)
+    coalescer.take_count(entry)
+    assert coalescer.request_refresh(entry)
+
+    coalescer.close(entry)
+    coalescer.take_count(entry)
+    assert not coalescer.request_refresh(entry)
@@ -0,0 +1,70 @@
+"""
+Long contents of notices: their summary and the details shown on demand, all in the calling thread.
+"""
+import pytest
+
+from qt_user_massages import MessageBoxHandler, _DetailText, _summarize
+
+
+def details_values(content:str, details_file=None) -> dict:
+    return {"title": "Log", "content": content, "button_ok": "OK", "details_file": details_file}
+
+
+def test_summarize_keeps_first_and_last_lines():
+    text = "\n".join(f"line {i}" for i in range(100)) + "\n\n"
+    assert _summarize(text, 3) == "line 0\nline 1\nline 2\n[… 96 more lines, see the details …]\nline 99"
+
+
+def test_summarize_short_text_is_unchanged():
+    assert _summarize("one\ntwo", 3) == "one\ntwo"
+    assert _summarize("one\ntwo\nthree\nfour", 3) == "one\ntwo\nthree\nfour"
+
+
+def test_summarize_shortens_long_lines():
+    assert _summarize("x" * 500, 3, max_chars=10) == "x" * 10 + "…"
+
+
+def test_short_content_has_no_details():
+    values = details_values("Short")
+    assert MessageBoxHandler(details_threshold=100)._take_details(values) is None
+    assert values["content"] == "Short"
+
+
+def test_long_content_moves_to_details():
+    content = "\n".join(f"row {i}" for i in range(50))
+    values = details_values(content)
+    details = MessageBoxHandler(details_threshold=100, summary_lines=2)._take_details(values)
+
+    assert values["content"] == "row 0\nrow 1\n[… 47 more lines, see the details …]\nrow 49"
+    assert details.text is content
+    assert "".join(details.chunks()) == content
+
+
+def test_details_file(tmp_path):
+    log = tmp_path / "import.log"
+    log.write_text("skipped row 3\n", encoding="utf-8")
+    values = details_values("Done", log)
+    details = MessageBoxHandler(details_threshold=100)._take_details(values)
+
+    assert values["content"] == "Done"
+    assert "".join(details.chunks()) == "skipped row 3\n"
+
+
+def test_long_content_and_details_file_are_both_shown(tmp_path):
+    log = tmp_path / "import.log"
+    log.write_text("skipped row 3\n", encoding="utf-8")
+    content = "x" * 200
+    details = MessageBoxHandler(details_threshold=100)._take_details(details_values(content, log))
+
+    assert "".join(details.chunks()) == content + "\n\nskipped row 3\n"
+
+
+def test_details_are_read_in_chunks(monkeypatch):
+    monkeypatch.setattr(_DetailText, "CHUNK", 4)
+    assert list(_DetailText("abcdefghij").chunks()) == ["abcd", "efgh", "ij"]
+
+
+@pytest.mark.parametrize("text, path", [("same", None), (None, "same.log"), ("same", "same.log")])
+def test_details_key(text, path):
+    assert _DetailText(text, path).key == _DetailText(text, path).key
+    assert _DetailText(text, path).key != _DetailText("other", "other.log").key
@@ -0,0 +1,42 @@
+"""
+`_OptionIndex` lookups of the filtered combo box. No dialog is shown.
+"""
+from qt_user_massages import _OptionIndex
+
+OPTIONS = ["Banana", "apple pie", "Pineapple", "Apple", "grape", "APPLESAUCE", "Crab apple"]
+
+
+def test_prefix_matches_before_substring_matches():
+    index = _OptionIndex(OPTIONS)
+    # Each group in the original order
+    assert index.match("apple") == [1, 3, 5, 2, 6]
+
+
+def test_ignores_case():
+    index = _OptionIndex(OPTIONS)
+    assert index.match("APPLE") == index.match("apple")
+    streets = _OptionIndex(["Straße", "STRASSE", "Strasbourg"])
+    assert streets.match("strass") == streets.match("ß") == [0, 1]
+
+
+def test_empty_query_matches_everything():
+    assert _OptionIndex(OPTIONS).match("") == list(range(len(OPTIONS)))
+
+
+def test_no_match():
+    assert _OptionIndex(OPTIONS).match("cherry") == []
+    assert _OptionIndex([]).match("apple") == []
+
+
+def test_each_option_once():
+    assert _OptionIndex(["anana", "banana", "cabana"]).match("ana") == [0, 1, 2]
+    assert _OptionIndex(["aaa"]).match("a") == [0]
+
+
+def test_matches_do_not_span_options():
+    # The options are joined by line feeds, which are spaces in the options
+    index = _OptionIndex(["one", "two\nthree", 4])
+    assert index.match("e\nt") == []
+    assert index.match("o t") == [1]
+    assert index.match("two three") == [1]
+    assert index.match("4") == [2]
@@ -0,0 +1,102 @@
+"""
+`HeadlessBackend` answering dialogs from its policy, alone and behind a handler. No QApplication is needed.
+"""
+import pytest
+
+from qt_user_massages import MessageBoxHandler, HeadlessBackend, DialogPrompt
+
+BUTTONS = {"button_yes": "Save", "button_no": "Discard", "button_continue": "Later"}
+
+
+def prompt(kind:str, title:str = "Title", **fields) -> DialogPrompt:
+    return DialogPrompt(kind, title, "Content", fields, "MainThread", 0.0)
+
+
+@pytest.mark.parametrize("answer, expected", [(None, True), (False, False), (0, False), ("yes", True)])
+def test_normalize_yes_no(answer, expected):
+    assert HeadlessBackend._normalize(prompt("yes_no"), answer) is expected
+
+
+@pytest.mark.parametrize("answer, expected", [(None, "Save"), (1, "Discard"), ("Later", "Later"),
+                                              ("CONTINUE", "Later"), ("no", "Discard")])
+def test_normalize_yes_no_continue(answer, expected):
+    assert HeadlessBackend._normalize(prompt("yes_no_continue", **BUTTONS), answer) == expected
+
+
+def test_normalize_yes_no_continue_rejects_unknown_buttons():
+    with pytest.raises(ValueError):
+        HeadlessBackend._normalize(prompt("yes_no_continue", **BUTTONS), "Maybe")
+
+
+@pytest.mark.parametrize("kind", ["combo_box", "filtered_combo_box"])
+def test_normalize_combo_box(kind):
+    options = ["red", "green", "blue"]
+    assert HeadlessBackend._normalize(prompt(kind, options=options), None) == "red"
+    assert HeadlessBackend._normalize(prompt(kind, options=options), 2) == "blue"
+    assert HeadlessBackend._normalize(prompt(kind, options=options), "green") == "green"
+    assert HeadlessBackend._normalize(prompt(kind, options=[]), None) is None
+
+
+def test_normalize_yes_no_batch():
+    batch = prompt("yes_no_batch", items=["a", "b", "c"], checked=True)
+    assert HeadlessBackend._normalize(batch, None) == [True, True, True]
+    assert HeadlessBackend._normalize(batch, False) == [False, False, False]
+    assert HeadlessBackend._normalize(batch, [1, 0, "x"]) == [True, False, True]
+
+
+@pytest.mark.parametrize("answer", [[True], [True, False, True, False]])
+def test_normalize_yes_no_batch_rejects_a_wrong_number_of_answers(answer):
+    with pytest.raises(ValueError):
+        HeadlessBackend._normalize(prompt("yes_no_batch", items=["a", "b", "c"], checked=True), answer)
+
+
+@pytest.mark.parametrize("kind", ["info", "warning", "error", "instruction", "progress"])
+def test_normalize_notices(kind):
+    assert HeadlessBackend._normalize(prompt(kind), "ignored") is None
+
+
+def test_normalize_registered_kind_keeps_the_answer():
+    assert HeadlessBackend._normalize(prompt("rating"), 4) == 4
+
+
+def test_rules_in_order():
+    backend = HeadlessBackend(answers={"yes_no": True},
+                              rules=[("^Delete", False),
+                                     ("Export", {"combo_box": 1}),
+                                     ("Export", lambda p: p.fields["options"][-1])])
+    assert backend.respond("yes_no", "Delete all", "Sure?") is False
+    assert backend.respond("yes_no", "Keep all", "Sure?") is True
+    # A dict without the kind falls through to the next rule
+    assert backend.respond("combo_box", "Export", "Format?", options=["csv", "json"]) == "json"
+    assert backend.respond("filtered_combo_box", "Export", "Format?", options=["csv", "xml"]) == "xml"
+
+
+def test_responder_falls_through_on_none():
+    backend = HeadlessBackend(answers={"yes_no": False}, rules=[("Rule", True)],
+                              responder=lambda p: "Discard" if p.kind == "yes_no_continue" else None)
+    assert backend.respond("yes_no_continue", "Rule", "Save?", **BUTTONS) == "Discard"
+    assert backend.respond("yes_no", "Rule", "Sure?") is True
+    assert backend.respond("yes_no", "Other", "Sure?") is False
+
+
+def test_prompts_are_recorded():
+    backend = HeadlessBackend(max_records=2)
+    backend.respond("info", "First", "One")
+    backend.respond("yes_no", "Second", "Two")
+    backend.respond("yes_no", "Third", "Three")
+
+    assert [(p.title, p.answer) for p in backend.prompts] == [("Second", True), ("Third", True)]
+
+
+def test_handler_answers_from_the_backend():
+    backend = HeadlessBackend(answers={"yes_no": False, "yes_no_batch": [True, False]})
+    handler = MessageBoxHandler(backend=backend)
+
+    assert handler.yes_no_message("Quit", "Really?") is False
+    assert handler.yes_no_message("Quit", "Really?", as_future=True).result() is False
+    assert handler.yes_no_batch_message("Cleanup", "Delete?", items=["a", "b"]) == [True, False]
+    assert handler.info_message("Done", "Finished") is None
+    assert [p.kind for p in backend.prompts] == ["yes_no", "yes_no", "yes_no_batch", "info"]
+
+    with pytest.raises(ValueError):
+        handler.yes_no_batch_message("Cleanup", "Delete?", items=["a", "b", "c"])
@@ -0,0 +1,72 @@
+"""
+`DialogMetrics` fed with hand-made timings, no dialog is shown.
+"""
+import json
+
+from qt_user_massages import DialogMetrics, DialogTiming
+
+
+def timing(kind:str, thread:str = "MainThread", response:float = 0.2) -> DialogTiming:
+    result = DialogTiming(kind, thread, called=10.0)
+    result.started = 10.001
+    result.built = 10.003
+    result.shown = 10.004
+    result.closed = 10.004 + response
+    return result
+
+
+def test_record_counts_and_histograms():
+    metrics = DialogMetrics()
+    metrics.record(timing("yes_no", response=0.2))
+    metrics.record(timing("yes_no", response=2.0))
+    metrics.record(timing("info", thread="Worker"))
+
+    snapshot = metrics.snapshot()
+    assert snapshot["dialogs"] == [{"kind": "info", "thread": "Worker", "count": 1},
+                                   {"kind": "yes_no", "thread": "MainThread", "count": 2}]
+
+    response = next(item for item in snapshot["phases"] if item["phase"] == "response" and item["kind"] == "yes_no")
+    assert response["count"] == 2
+    assert abs(response["sum"] - 2.2) < 1e-9
+    assert response["buckets"]["0.1"] == 0
+    assert response["buckets"]["0.25"] == 1
+    assert response["buckets"]["2.5"] == 2
+    assert response["buckets"]["+Inf"] == 2
+
+
+def test_hooks_and_recent():
+    metrics = DialogMetrics(keep_last=1)
+    seen = []
+    metrics.add_hook(seen.append)
+    first, second = timing("info"), timing("error")
+    metrics.record(first)
+    metrics.remove_hook(seen.append)
+    metrics.record(second)
+
+    assert seen == [first]
+    assert list(metrics.recent) == [second]
+
+
+def test_to_json():
+    metrics = DialogMetrics()
+    metrics.record(timing("info"))
+    assert json.loads(metrics.to_json()) == metrics.snapshot()
+
+
+def test_to_prometheus():
+    metrics = DialogMetrics()
+    metrics.record(timing("yes_no"))
+    text = metrics.to_prometheus(prefix="app_dialog")
+
+    assert text.endswith("\n")
+    assert "# TYPE app_dialogs_total counter" in text
+    assert 'app_dialogs_total{kind="yes_no",thread="MainThread"} 1' in text.splitlines()
+    assert 'app_dialog_phase_seconds_bucket{phase="response",kind="yes_no",le="0.25"} 1' in text.splitlines()
+    assert 'app_dialog_phase_seconds_count{phase="response",kind="yes_no"} 1' in text.splitlines()
+
+
+def test_to_prometheus_escapes_label_values():
+    metrics = DialogMetrics()
+    metrics.record(timing("yes_no", thread='Worker "A"\\1\nnext'))
+
+    assert 'qt_dialogs_total{kind="yes_no",thread="Worker \\"A\\"\\\\1\\nnext"} 1' in metrics.to_prometheus().splitlines()
@@ -0,0 +1,116 @@
+"""
+`_DialogScheduler` ordering and overflow policies, with plain futures as requests. No dialog is shown.
+"""
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from qt_user_massages import _DialogScheduler, DialogQueueFull
+
+
+def request(name:str) -> tuple:
+    return (Future(), name, None)
+
+
+def drain(scheduler:_DialogScheduler) -> list:
+    names = []
+    while True:
+        taken = scheduler.acquire()
+        if taken is None: return names
+        names.append(taken[1])
+        scheduler.release()
+
+
+def test_priority_order():
+    scheduler = _DialogScheduler(max_visible=1, capacity=10, overflow="block")
+    for priority, name in [(3, "info"), (0, "error"), (3, "info 2"), (1, "warning"), (0, "error 2")]:
+        assert scheduler.put(priority, request(name), wait=True)
+
+    assert len(scheduler) == 5
+    assert drain(scheduler) == ["error", "error 2", "warning", "info", "info 2"]
+
+
+def test_max_visible():
+    scheduler = _DialogScheduler(max_visible=2, capacity=10, overflow="block")
+    for name in "abc":
+        scheduler.put(0, request(name), wait=True)
+
+    assert scheduler.acquire()[1] == "a"
+    assert scheduler.acquire()[1] == "b"
+    assert scheduler.acquire() is None
+    scheduler.release()
+    assert scheduler.acquire()[1] == "c"
+
+
+def test_unknown_overflow():
+    with pytest.raises(ValueError):
+        _DialogScheduler(max_visible=1, capacity=1, overflow="wait")
+
+
+def test_overflow_drop():
+    scheduler = _DialogScheduler(max_visible=1, capacity=2, overflow="drop")
+    assert scheduler.put(0, request("a"), wait=True)
+    assert scheduler.put(0, request("b"), wait=True)
+    assert not scheduler.put(0, request("c"), wait=True)
+    assert drain(scheduler) == ["a", "b"]
+
+
+def test_overflow_reject():
+    scheduler = _DialogScheduler(max_visible=1, capacity=1, overflow="reject")
+    scheduler.put(0, request("a"), wait=True)
+    with pytest.raises(DialogQueueFull):
+        scheduler.put(0, request("b"), wait=True)
+
+
+def test_cancelled_requests_make_room():
+    scheduler = _DialogScheduler(max_visible=1, capacity=1, overflow="reject")
+    cancelled = request("a")
+    scheduler.put(0, cancelled, wait=True)
+    cancelled[0].cancel()
+
+    assert scheduler.put(0, request("b"), wait=True)
+    assert drain(scheduler) == ["b"]
+
+
+def test_overflow_block_waits_for_room():
+    scheduler = _DialogScheduler(max_visible=1, capacity=1, overflow="block")
+    scheduler.put(0, request("a"), wait=True)
+    queued = threading.Event()
+
+    def put():
+        scheduler.put(0, request("b"), wait=True)
+        queued.set()
+
+    threading.Thread(target=put, daemon=True).start()
+    assert not queued.wait(0.2)
+
+    assert scheduler.acquire()[1] == "a"
+    assert queued.wait(5)
+    assert len(scheduler) == 1
+
+
+def test_overflow_block_queues_callers_that_may_not_wait():
+    scheduler = _DialogScheduler(max_visible=1, capacity=1, overflow="block")
+    scheduler.put(0, request("a"), wait=True)
+    assert scheduler.put(0, request("b"), wait=False)
+    assert len(scheduler) == 2
+
+
+def test_close_cancels_and_releases_waiting_callers():
+    scheduler = _DialogScheduler(max_visible=1, capacity=1, overflow="block")
+    queued = request("a")
+    scheduler.put(0, queued, wait=True)
+    result = []
+
+    thread = threading.Thread(target=lambda: result.append(scheduler.put(0, request("b"), wait=True)), daemon=True)
+    thread.start()
+    time.sleep(0.1)
+    scheduler.close()
+    thread.join(5)
+
+    assert result == [False]
+    assert queued[0].cancelled()
+    assert not scheduler.put(0, request("c"), wait=True)
+    assert scheduler.acquire() is None
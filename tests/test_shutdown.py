@@ -0,0 +1,64 @@
+"""
+Calls made after `MessageBoxHandler.shutdown` must return, not wait for a GUI thread that has ended.
+
+Each case runs in a fresh interpreter: `gui_thread=True` creates the QApplication, so the process must not have one,
+and a call that hangs fails the test on the timeout instead of hanging the test run.
+"""
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SETUP = """
+import json
+from qt_user_massages import MessageBoxHandler
+handler = MessageBoxHandler(gui_thread=True)
+"""
+
+
+def run(script:str) -> dict:
+    """
+    :return: The JSON object the script printed last.
+    """
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONPATH=ROOT)
+    output = subprocess.run([sys.executable, "-c", SETUP + textwrap.dedent(script)], env=env, check=True,
+                            capture_output=True, text=True, timeout=60).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+@pytest.mark.parametrize("first_dialog", [False, True], ids=["before_setup", "after_setup"])
+def test_calls_after_shutdown_return(first_dialog):
+    res = run(f"""
+        if {first_dialog}: handler.info_message("Ready", "Set up.", timeout=0.05)
+        handler.shutdown(timeout=10)
+        res = {{
+            "warmup": handler.warmup(),
+            "yes_no": handler.yes_no_message("Late", "Shown?", timeout=0.05),
+            "future_cancelled": handler.yes_no_message("Late", "Shown?", as_future=True).cancelled(),
+            "info": handler.info_message("Late", "Shown?", block=False),
+        }}
+        handler.notify("Late", "Shown?")
+        handler.prefetch_images([])
+        handler.progress_message("Late", "Shown?")
+        print(json.dumps(res))
+    """)
+    assert res == {"warmup": None, "yes_no": None, "future_cancelled": True, "info": None}
+
+
+def test_warmup_after_shutdown_from_worker_thread():
+    res = run("""
+        import threading
+        handler.shutdown(timeout=10)
+        res = {}
+        worker = threading.Thread(target=lambda: res.update(warmup=handler.warmup(),
+                                                            yes_no=handler.yes_no_message("Late", "Shown?")))
+        worker.start()
+        worker.join(30)
+        print(json.dumps(dict(res, alive=worker.is_alive())))
+    """)
+    assert res == {"warmup": None, "yes_no": None, "alive": False}
@@ -0,0 +1,81 @@
+"""
+What a `MessageBoxHandler` sets up of Qt before it shows a dialog, each case in a fresh interpreter.
+"""
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(script:str) -> dict:
+    """
+    :return: The JSON object the script printed last.
+    """
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONPATH=ROOT)
+    output = subprocess.run([sys.executable, "-c", textwrap.dedent(script)], env=env, check=True,
+                            capture_output=True, text=True, timeout=60).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_import_doesnt_load_qt():
+    res = run("""
+        import json
+        import sys
+        import qt_user_massages
+
+        res = {"import": "PyQt5.QtWidgets" in sys.modules}
+        from qt_user_massages import MessageBoxHandler
+        res["use"] = "PyQt5.QtWidgets" in sys.modules
+        res["module"] = MessageBoxHandler.__module__
+        res["dir"] = "MessageBoxHandler" in dir(qt_user_massages)
+        try:
+            qt_user_massages.missing
+        except AttributeError as error:
+            res["missing"] = str(error)
+        print(json.dumps(res))
+    """)
+    assert res == {"import": False, "use": True, "module": "qt_user_massages_qt", "dir": True,
+                   "missing": "module 'qt_user_massages' has no attribute 'missing'"}
+
+
+def test_remembered_answers_dont_touch_qt():
+    res = run("""
+        import json
+        from qt_user_massages import MessageBoxHandler, AnswerCache, QApplication
+
+        cache = AnswerCache()
+        cache.put(("yes_no", "Delete", "Delete it?", ("Yes", "No")), True)
+        handler = MessageBoxHandler(answer_cache=cache)
+        res = {
+            "answer": handler.yes_no_message("Delete", "Delete it?"),
+            "future": handler.yes_no_message("Delete", "Delete it?", as_future=True).result(timeout=0),
+        }
+        ask = handler.apply_to_all()
+        ask.answers["yes_no"] = False
+        res["applied"] = ask.yes_no_message("Delete", "Delete the next one?")
+        res["qapplication"] = QApplication.instance() is not None
+        print(json.dumps(res))
+    """)
+    assert res == {"answer": True, "future": True, "applied": False, "qapplication": False}
+
+
+def test_new_qapplication_gets_new_styles():
+    res = run("""
+        import gc
+        import json
+        from qt_user_massages import MessageBoxHandler, QApplication
+
+        app = QApplication([])
+        MessageBoxHandler().info_message("First", "Styled", timeout=0.05)
+        # The shared style is deleted along with the QApplication
+        del app
+        gc.collect()
+
+        app = QApplication([])
+        MessageBoxHandler().info_message("Second", "Styled", timeout=0.05)
+        print(json.dumps({"shown": True}))
+    """)
+    assert res == {"shown": True}
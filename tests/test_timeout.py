@@ -0,0 +1,70 @@
+"""
+Dialog timeouts, with the dialogs shown by this process's QApplication.
+"""
+import threading
+import time
+
+import pytest
+from PyQt5.QtCore import QTimer, QEvent
+from PyQt5.QtWidgets import QApplication
+
+from qt_user_massages import MessageBoxHandler
+
+
+def close_window(title:str) -> None:
+    for widget in QApplication.topLevelWidgets():
+        if widget.isVisible() and widget.windowTitle() == title: widget.close()
+
+
+def run_until(condition, seconds:float) -> None:
+    deadline = time.perf_counter() + seconds
+    while not condition() and time.perf_counter() < deadline:
+        QApplication.processEvents()
+        # Outside of a running event loop only this deletes the closed dialogs
+        QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+        time.sleep(0.005)
+
+
+@pytest.mark.parametrize("modeless", [False, True])
+def test_timeout_returns_while_a_later_dialog_is_open(app, modeless):
+    handler = MessageBoxHandler(modeless=modeless)
+    res = {}
+
+    def worker():
+        start = time.perf_counter()
+        res["answer"] = handler.yes_no_message("Timed", "Closes itself", timeout=0.3, default=True)
+        res["seconds"] = time.perf_counter() - start
+        res["timed_out"] = handler.timed_out()
+
+    def open_untimed():
+        # Shown above the timed dialog from the main thread, in a loop of its own, until it is closed
+        QTimer.singleShot(3000, lambda: close_window("Untimed"))
+        handler.info_message("Untimed", "Stays open")
+
+    # Fires while the timed dialog is shown
+    QTimer.singleShot(100, open_untimed)
+    thread = threading.Thread(target=worker)
+    thread.start()
+    run_until(lambda: not thread.is_alive(), 10)
+    thread.join(5)
+
+    assert res["answer"] is True and res["timed_out"]
+    assert res["seconds"] < 2
+
+
+def test_timed_dialog_outlives_the_dialog_it_was_shown_over(app):
+    handler = MessageBoxHandler()
+    res = {}
+
+    def worker():
+        res["answer"] = handler.yes_no_message("Timed", "Shown over the other one", timeout=0.5, default=True)
+
+    thread = threading.Thread(target=worker)
+    QTimer.singleShot(50, thread.start)
+    # Closed and deleted while the timed dialog is still shown
+    QTimer.singleShot(300, lambda: close_window("Outer"))
+    handler.info_message("Outer", "Shown first, from the main thread")
+    run_until(lambda: not thread.is_alive(), 5)
+    thread.join(5)
+
+    assert res == {"answer": True}